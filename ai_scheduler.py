@@ -0,0 +1,84 @@
+# ai_scheduler.py
+
+from collections import deque
+
+import numpy as np
+
+from constants import AI_LOD_BUDGET, AI_LOD_TIERS
+
+
+class AIScheduler:
+    """
+    Level-of-detail scheduling for enemy AI. Whenever an enemy's AI runs, its distance to the
+    player picks a tier: engaged enemies run every tick, wandering ones every few ticks.
+    Enemies waiting for their turn are not touched at all; when it comes they move and age
+    by everything they missed in one go. At most budget lower-tier updates run per tick,
+    the rest carry over to the next tick, most overdue first.
+    """
+
+    def __init__(self, tiers=AI_LOD_TIERS, budget=AI_LOD_BUDGET):
+        self.reaches = np.array([reach for reach, _ in tiers], dtype=float)
+        self.intervals = np.array([interval for _, interval in tiers], dtype=np.int64)
+        self.budget = budget
+        self.tick = 0
+
+        # Enemies updated every tick, enemies queued by the tick they are next due,
+        # and due enemies still waiting for budget
+        self.engaged = []
+        self.waiting = {}
+        self.backlog = deque()
+
+    def add(self, enemy, time):
+        """
+        Schedule a newly spawned enemy; its first update runs as soon as the budget allows.
+        """
+        enemy.ai_interval = 1
+        enemy.ai_moved_at = time
+        self.backlog.append(enemy)
+
+    def due(self):
+        """
+        Returns the live enemies whose AI runs this tick: every engaged enemy, then up to
+        budget lower-tier ones.
+        """
+        self.backlog.extend(self.waiting.pop(self.tick, ()))
+        due = [enemy for enemy in self.engaged if enemy.sprite_lists]
+        granted = 0
+        while self.backlog and granted < self.budget:
+            enemy = self.backlog.popleft()
+            if enemy.sprite_lists:
+                due.append(enemy)
+                granted += 1
+        return due
+
+    def reschedule(self, enemies, distances):
+        """
+        Pick the next tier of each enemy that ran this tick from its distance to the player,
+        queue its next update and move on to the next tick.
+        """
+        intervals = self.intervals[
+            np.minimum(np.searchsorted(self.reaches, distances), len(self.intervals) - 1)
+        ]
+        self.engaged = []
+        for enemy, interval in zip(enemies, intervals.tolist()):
+            enemy.ai_interval = interval
+            if interval == 1:
+                self.engaged.append(enemy)
+            else:
+                self.waiting.setdefault(self.tick + interval, []).append(enemy)
+        self.tick += 1
+
+    def clear(self):
+        """
+        Forget every scheduled enemy, e.g. once a wave is over and its enemies may be reused.
+        """
+        self.engaged = []
+        self.waiting = {}
+        self.backlog = deque()
+
+    def stats(self):
+        return {
+            "engaged": len(self.engaged),
+            "waiting": sum(len(enemies) for enemies in self.waiting.values()),
+            "backlog": len(self.backlog),
+        }
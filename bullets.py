@@ -0,0 +1,408 @@
+# bullets.py
+
+import math
+
+import arcade
+import numpy as np
+
+from constants import (
+    BOSS_BULLET_DAMAGE,
+    BOSS_BULLET_SPEED,
+    BULLET_CAPACITY,
+    BULLET_DRAW_SEGMENTS,
+    BULLET_GRID_CELL_SIZE,
+    BULLET_TARGETS,
+    ENEMY_BULLET_DAMAGE,
+    ENEMY_BULLET_SPEED,
+    PLAYER_BULLET_DAMAGE,
+    PLAYER_BULLET_SPEED,
+    WALL_GRID_CELL_SIZE,
+    WORLD_CENTER_X,
+    WORLD_CENTER_Y,
+    WORLD_RADIUS,
+)
+
+# Cell keys pack (cell_x, cell_y) into one int64; cells are offset so both halves stay non-negative
+_KEY_OFFSET = 1 << 20
+_KEY_STRIDE = 1 << 21
+
+# Owners are stored as small ints; the index into this tuple
+OWNERS = ('player', 'enemy', 'boss')
+
+# radius, speed, damage and color of each owner's bullets
+BULLET_TYPES = {
+    'player': (5, PLAYER_BULLET_SPEED, PLAYER_BULLET_DAMAGE, arcade.color.YELLOW),
+    'enemy': (5, ENEMY_BULLET_SPEED, ENEMY_BULLET_DAMAGE, arcade.color.RED),
+    'boss': (7, BOSS_BULLET_SPEED, BOSS_BULLET_DAMAGE, arcade.color.PURPLE),
+}
+
+
+def _circles_touch_boxes(x, y, radius, boxes):
+    """
+    (B, T) mask of which circles overlap which left, bottom, right, top boxes.
+    """
+    nearest_x = np.clip(x[:, None], boxes[None, :, 0], boxes[None, :, 2])
+    nearest_y = np.clip(y[:, None], boxes[None, :, 1], boxes[None, :, 3])
+    dx = x[:, None] - nearest_x
+    dy = y[:, None] - nearest_y
+    return dx * dx + dy * dy <= (radius * radius)[:, None]
+
+
+def _sweep_entry(x, y, dx, dy, radius, boxes):
+    """
+    (B, T) fraction of each bullet's path (x, y) + t * (dx, dy), t in [0, 1], at which it
+    first touches each left, bottom, right, top box, or inf where it never does.
+    """
+    return _path_entry(
+        x[:, None], y[:, None], dx[:, None], dy[:, None], radius[:, None],
+        boxes[None, :, 0], boxes[None, :, 1], boxes[None, :, 2], boxes[None, :, 3],
+    )
+
+
+def _path_entry(x, y, dx, dy, radius, left, bottom, right, top):
+    """
+    Element-wise _sweep_entry: the fraction of the path (x, y) + t * (dx, dy) at which it first
+    touches the box left, bottom, right, top, or inf. Arguments broadcast against each other.
+    Boxes are grown by the bullet radius, so corners count as square rather than rounded.
+    """
+    left = left - radius
+    bottom = bottom - radius
+    right = right + radius
+    top = top + radius
+
+    entries = []
+    exits = []
+    for start, delta, low, high in ((x, dx, left, right), (y, dy, bottom, top)):
+        moving = delta != 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_low = (low - start) / delta
+            t_high = (high - start) / delta
+        # Not moving along this axis: always inside the slab or never
+        inside = (low <= start) & (start <= high)
+        entries.append(np.where(moving, np.minimum(t_low, t_high), np.where(inside, -np.inf, np.inf)))
+        exits.append(np.where(moving, np.maximum(t_low, t_high), np.where(inside, np.inf, -np.inf)))
+
+    t_enter = np.maximum(*entries)
+    t_exit = np.minimum(*exits)
+    touches = (t_enter <= t_exit) & (t_exit >= 0) & (t_enter <= 1)
+    return np.where(touches, np.maximum(t_enter, 0), np.inf)
+
+
+def _box_cells(boxes, cell_size):
+    """
+    (item, key) rows for every grid cell each left, bottom, right, top box overlaps.
+    """
+    min_cx = np.floor(boxes[:, 0] / cell_size).astype(np.int64)
+    min_cy = np.floor(boxes[:, 1] / cell_size).astype(np.int64)
+    span_x = np.floor(boxes[:, 2] / cell_size).astype(np.int64) - min_cx + 1
+    span_y = np.floor(boxes[:, 3] / cell_size).astype(np.int64) - min_cy + 1
+    counts = span_x * span_y
+    item = np.repeat(np.arange(len(boxes)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell_x = min_cx[item] + offset // span_y[item]
+    cell_y = min_cy[item] + offset % span_y[item]
+    return item, (cell_x + _KEY_OFFSET) * _KEY_STRIDE + (cell_y + _KEY_OFFSET)
+
+
+def _box_pairs(boxes_a, boxes_b, cell_size=BULLET_GRID_CELL_SIZE):
+    """
+    (i, j) arrays of the pairs of boxes from boxes_a and boxes_b that share a grid cell,
+    each pair once and sorted by i. Only these pairs can overlap.
+    """
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    a_item, a_key = _box_cells(boxes_a, cell_size)
+    b_item, b_key = _box_cells(boxes_b, cell_size)
+    order = np.argsort(b_key, kind='stable')
+    b_item, b_key = b_item[order], b_key[order]
+
+    # Expand each a cell into one row per b box bucketed in the same cell
+    starts = np.searchsorted(b_key, a_key, side='left')
+    counts = np.searchsorted(b_key, a_key, side='right') - starts
+    first = np.repeat(a_item, counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = b_item[np.repeat(starts, counts) + offset]
+
+    # Boxes spanning several cells meet more than once
+    pairs = np.unique(first * len(boxes_b) + second)
+    return pairs // len(boxes_b), pairs % len(boxes_b)
+
+
+class BulletSystem:
+    """
+    Every bullet in flight, stored as preallocated NumPy columns (position, velocity, radius,
+    owner, damage) so movement, culling and hit tests run as whole-array operations.
+    Live bullets are always the first count rows, in the order they were fired.
+    Hits are tested along the whole path a bullet moved this step, not just where it ended,
+    so bullets cannot pass through thin walls or actors at large steps.
+    """
+
+    def __init__(self, capacity=BULLET_CAPACITY):
+        self.count = 0
+
+        # Times the columns had to grow
+        self.allocations = 0
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.change_x = np.empty(capacity)
+        self.change_y = np.empty(capacity)
+        self.radius = np.empty(capacity)
+        self.damage = np.empty(capacity, dtype=np.int64)
+        self.owner = np.empty(capacity, dtype=np.int8)
+
+        # Where each bullet started this step, and the fraction of the way from there to
+        # (x, y) at which it hit a wall or left the world (inf while still flying)
+        self.start_x = np.empty(capacity)
+        self.start_y = np.empty(capacity)
+        self.stop_at = np.empty(capacity)
+
+        self.wall_rects = np.empty((0, 4))
+        self.wall_cells = {}
+
+    def __len__(self):
+        return self.count
+
+    def _columns(self):
+        return ('x', 'y', 'change_x', 'change_y', 'radius', 'damage', 'owner', 'start_x', 'start_y', 'stop_at')
+
+    def set_walls(self, rects):
+        """
+        Register the static wall rectangles (left, bottom, right, top) bullets stop at.
+        Each wall is bucketed into every grid cell within a bullet radius of it, so a bullet
+        only needs to test the walls of the cells its path passes over.
+        """
+        self.wall_rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+        padding = max(radius for radius, _, _, _ in BULLET_TYPES.values())
+        buckets = {}
+        for index, (left, bottom, right, top) in enumerate(self.wall_rects.tolist()):
+            for cx in range(math.floor((left - padding) / WALL_GRID_CELL_SIZE),
+                            math.floor((right + padding) / WALL_GRID_CELL_SIZE) + 1):
+                for cy in range(math.floor((bottom - padding) / WALL_GRID_CELL_SIZE),
+                                math.floor((top + padding) / WALL_GRID_CELL_SIZE) + 1):
+                    buckets.setdefault((cx, cy), []).append(index)
+        self.wall_cells = {cell: np.array(indices, dtype=np.intp) for cell, indices in buckets.items()}
+
+    def spawn(self, x, y, angle, owner):
+        """
+        Fire a bullet of the owner's type from (x, y) towards angle (in degrees).
+        """
+        if self.count == len(self.x):
+            # Out of room: double every column
+            self.allocations += 1
+            for name in self._columns():
+                column = getattr(self, name)
+                grown = np.empty(2 * len(column), dtype=column.dtype)
+                grown[:self.count] = column[:self.count]
+                setattr(self, name, grown)
+
+        radius, speed, damage, _ = BULLET_TYPES[owner]
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.change_x[index] = math.cos(math.radians(angle)) * speed
+        self.change_y[index] = math.sin(math.radians(angle)) * speed
+        self.radius[index] = radius
+        self.damage[index] = damage
+        self.owner[index] = OWNERS.index(owner)
+        self.start_x[index] = x
+        self.start_y[index] = y
+        self.stop_at[index] = np.inf
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def remove(self, mask):
+        """
+        Remove the live bullets where mask is True, keeping the others in order.
+        """
+        keep = ~mask
+        kept = int(keep.sum())
+        if kept == self.count:
+            return
+        for name in self._columns():
+            column = getattr(self, name)
+            column[:kept] = column[:self.count][keep]
+        self.count = kept
+
+    def update(self, delta_time):
+        """
+        Move every bullet by its velocity (pixels per second) over delta_time seconds.
+        """
+        n = self.count
+        self.start_x[:n] = self.x[:n]
+        self.start_y[:n] = self.y[:n]
+        self.stop_at[:n] = np.inf
+        self.x[:n] += self.change_x[:n] * delta_time
+        self.y[:n] += self.change_y[:n] * delta_time
+
+    def stop_at_world_edge(self):
+        """
+        Stop bullets where their path this step leaves the world circle.
+        """
+        n = self.count
+        fx = self.start_x[:n] - WORLD_CENTER_X
+        fy = self.start_y[:n] - WORLD_CENTER_Y
+        dx = self.x[:n] - self.start_x[:n]
+        dy = self.y[:n] - self.start_y[:n]
+        outside = np.flatnonzero(np.hypot(fx + dx, fy + dy) > WORLD_RADIUS)
+        if len(outside) == 0:
+            return
+
+        # Larger root of |f + t * d| = WORLD_RADIUS; clamped to 0 for bullets that started outside
+        fx, fy, dx, dy = fx[outside], fy[outside], dx[outside], dy[outside]
+        a = dx * dx + dy * dy
+        b = fx * dx + fy * dy
+        c = fx * fx + fy * fy - WORLD_RADIUS * WORLD_RADIUS
+        exit_time = (-b + np.sqrt(np.maximum(b * b - a * c, 0))) / a
+        self.stop_at[outside] = np.minimum(self.stop_at[outside], np.maximum(exit_time, 0))
+
+    def stop_at_walls(self):
+        """
+        Stop bullets at the first wall their path touches this step, testing each bullet
+        only against the walls of the cells its path passes over.
+        """
+        n = self.count
+        if n == 0 or not self.wall_cells:
+            return
+        start_x, start_y = self.start_x[:n], self.start_y[:n]
+        dx = self.x[:n] - start_x
+        dy = self.y[:n] - start_y
+        radius = self.radius[:n]
+
+        # Cell range covered by each path
+        min_cx = np.floor(np.minimum(start_x, self.x[:n]) / WALL_GRID_CELL_SIZE).astype(np.int64)
+        min_cy = np.floor(np.minimum(start_y, self.y[:n]) / WALL_GRID_CELL_SIZE).astype(np.int64)
+        max_cx = np.floor(np.maximum(start_x, self.x[:n]) / WALL_GRID_CELL_SIZE).astype(np.int64)
+        max_cy = np.floor(np.maximum(start_y, self.y[:n]) / WALL_GRID_CELL_SIZE).astype(np.int64)
+
+        # Group bullets by cell range so each range is tested once, as a block
+        order = np.lexsort((max_cy, max_cx, min_cy, min_cx))
+        changes = np.zeros(max(n - 1, 0), dtype=bool)
+        for column in (min_cx, min_cy, max_cx, max_cy):
+            changes |= np.diff(column[order]) != 0
+        boundaries = np.flatnonzero(changes) + 1
+
+        for group in np.split(order, boundaries):
+            first = group[0]
+            found = [
+                self.wall_cells[(cx, cy)]
+                for cx in range(int(min_cx[first]), int(max_cx[first]) + 1)
+                for cy in range(int(min_cy[first]), int(max_cy[first]) + 1)
+                if (cx, cy) in self.wall_cells
+            ]
+            if not found:
+                continue
+            walls = np.unique(np.concatenate(found))
+            entry = _sweep_entry(
+                start_x[group], start_y[group], dx[group], dy[group], radius[group], self.wall_rects[walls]
+            ).min(axis=1)
+            self.stop_at[group] = np.minimum(self.stop_at[group], entry)
+
+    def remove_stopped(self):
+        """
+        Remove bullets that hit a wall or left the world this step.
+        """
+        self.remove(self.stop_at[:self.count] <= 1)
+
+    def collide(self, targets, handle_hit):
+        """
+        Resolve bullet hits on the sprites in targets (kind -> sprites, e.g. 'enemy' -> enemy_list),
+        following BULLET_TARGETS. Bullets are processed in the order they were fired; each
+        calls handle_hit(owner, target, damage) for the first sprite along its path this step,
+        before any wall or the world edge it stopped at, and is removed.
+        Sprites removed from their lists during this call no longer stop bullets.
+        If handle_hit returns True, the remaining bullets are left for the next tick.
+        """
+        n = self.count
+        hits = []
+        for code, owner in enumerate(OWNERS):
+            bullets = np.flatnonzero(self.owner[:n] == code)
+            sprites = [sprite for kind in BULLET_TARGETS[owner] for sprite in targets.get(kind, ())]
+            if len(bullets) == 0 or not sprites:
+                continue
+            start_x, start_y = self.start_x[bullets], self.start_y[bullets]
+            end_x, end_y = self.x[bullets], self.y[bullets]
+            radius = self.radius[bullets]
+
+            # Broad phase: bucket the box around each bullet's path and the square around each
+            # sprite's texture rectangle (which holds its hit box) in a grid, and only pair up
+            # bullets and sprites sharing a cell
+            paths = np.column_stack((
+                np.minimum(start_x, end_x) - radius, np.minimum(start_y, end_y) - radius,
+                np.maximum(start_x, end_x) + radius, np.maximum(start_y, end_y) + radius,
+            ))
+            circles = np.array(
+                [(sprite.center_x, sprite.center_y, math.hypot(sprite.width, sprite.height) / 2)
+                 for sprite in sprites], dtype=float,
+            )
+            rows, columns = _box_pairs(paths, np.column_stack((
+                circles[:, 0] - circles[:, 2], circles[:, 1] - circles[:, 2],
+                circles[:, 0] + circles[:, 2], circles[:, 1] + circles[:, 2],
+            )))
+            if len(rows) == 0:
+                continue
+
+            # Narrow phase on the paired sprites' exact hit boxes, built only for them
+            nearby, columns = np.unique(columns, return_inverse=True)
+            sprites = [sprites[i] for i in nearby.tolist()]
+            boxes = np.array(
+                [(sprite.left, sprite.bottom, sprite.right, sprite.top) for sprite in sprites], dtype=float
+            )[columns]
+            entry = _path_entry(
+                start_x[rows], start_y[rows], end_x[rows] - start_x[rows], end_y[rows] - start_y[rows],
+                radius[rows], boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3],
+            )
+            # A wall or the world edge reached first shields whatever lies behind it
+            reached = entry < self.stop_at[bullets][rows]
+            rows, columns, entry = rows[reached], columns[reached], entry[reached]
+
+            if len(rows) == 0:
+                continue
+
+            # Each bullet's sprites in the order its path reaches them
+            order = np.lexsort((entry, rows))
+            rows, columns = rows[order], columns[order]
+            starts = np.flatnonzero(np.r_[True, np.diff(rows) != 0])
+            for row, group in zip(rows[starts].tolist(), np.split(columns, starts[1:])):
+                hits.append((bullets[row], owner, [sprites[i] for i in group.tolist()]))
+
+        consumed = np.zeros(n, dtype=bool)
+        for index, owner, candidates in sorted(hits, key=lambda hit: hit[0]):
+            target = next((sprite for sprite in candidates if sprite.sprite_lists), None)
+            if target is None:
+                continue
+            consumed[index] = True
+            if handle_hit(owner, target, int(self.damage[index])):
+                break
+        self.remove(consumed)
+
+    def draw(self, time_offset=0.0):
+        """
+        Draw every bullet as a filled circle with one batched call per owner, time_offset seconds
+        away from its simulated position (negative to interpolate back towards the previous step).
+        Uses arcade's own filled-ellipse program, which turns each point into a circle, fed
+        with all the owner's bullet centers at once.
+        """
+        n = self.count
+        if n == 0:
+            return
+        ctx = arcade.get_window().ctx
+        program = ctx.shape_ellipse_filled_unbuffered_program
+        geometry = ctx.shape_ellipse_unbuffered_geometry
+        buffer = ctx.shape_ellipse_unbuffered_buffer
+
+        x = self.x[:n] + self.change_x[:n] * time_offset
+        y = self.y[:n] + self.change_y[:n] * time_offset
+        for code, owner in enumerate(OWNERS):
+            bullets = self.owner[:n] == code
+            count = int(bullets.sum())
+            if count:
+                radius, _, _, color = BULLET_TYPES[owner]
+                centers = np.column_stack((x[bullets], y[bullets])).astype(np.float32)
+                program['color'] = tuple(channel / 255 for channel in color[:3]) + (1.0,)
+                program['shape'] = radius, radius, 0
+                program['segments'] = BULLET_DRAW_SEGMENTS
+                buffer.orphan(size=centers.nbytes)
+                buffer.write(data=centers.tobytes())
+                geometry.render(program, mode=ctx.POINTS, vertices=count)
@@ -0,0 +1,150 @@
+# collision.py
+
+import numpy as np
+
+from constants import COLLISION_MAX_SLIDES
+
+
+class CollisionResolver:
+    """
+    Moves actors (player, enemies, bosses) by their velocity against the static walls.
+    Each actor's axis-aligned hit box is swept along its velocity; at the exact time of
+    impact with the nearest wall it stops on the wall's face and slides along it with what
+    is left of the move. All actors are resolved together, one vectorized pass per slide.
+    """
+
+    def __init__(self, edge_table, wall_grid):
+        self.edge_table = edge_table
+        self.wall_grid = wall_grid
+
+        # left, bottom, right, top of every wall, indexed like edge_table.walls
+        self.rects = np.array([
+            (wall.center_x - wall.width / 2, wall.center_y - wall.height / 2,
+             wall.center_x + wall.width / 2, wall.center_y + wall.height / 2)
+            for wall in edge_table.walls
+        ], dtype=float).reshape(-1, 4)
+
+    def walls_near(self, left, bottom, right, top):
+        """
+        Returns the indices of the walls with an edge registered around the rectangle.
+        """
+        edges = self.wall_grid.rect_candidates(left, bottom, right, top)
+        return np.unique(self.edge_table.wall_index[edges])
+
+    def move(self, actors, delta_time):
+        """
+        Move every actor by its velocity (change_x, change_y in pixels per second) over
+        delta_time seconds, stopping at walls and sliding along them.
+        delta_time may also be a sequence with one duration per actor.
+        """
+        if not actors:
+            return
+
+        x = np.array([actor.center_x for actor in actors], dtype=float)
+        y = np.array([actor.center_y for actor in actors], dtype=float)
+        delta_time = np.asarray(delta_time, dtype=float)
+        dx = np.array([actor.change_x for actor in actors], dtype=float) * delta_time
+        dy = np.array([actor.change_y for actor in actors], dtype=float) * delta_time
+        half_width = np.empty(len(actors))
+        half_height = np.empty(len(actors))
+        for index, actor in enumerate(actors):
+            # Unrotated hit box, so turning on the spot never pushes an actor into a wall
+            points = np.array(actor.get_hit_box(), dtype=float) * actor.scale
+            half_width[index] = np.abs(points[:, 0]).max()
+            half_height[index] = np.abs(points[:, 1]).max()
+
+        # Broad phase: walls around the whole sweep; every slide stays inside it
+        pair_actors = []
+        pair_walls = []
+        for index in np.flatnonzero((dx != 0) | (dy != 0)):
+            walls = self.walls_near(
+                min(x[index], x[index] + dx[index]) - half_width[index],
+                min(y[index], y[index] + dy[index]) - half_height[index],
+                max(x[index], x[index] + dx[index]) + half_width[index],
+                max(y[index], y[index] + dy[index]) + half_height[index],
+            )
+            pair_actors.append(np.full(len(walls), index, dtype=np.intp))
+            pair_walls.append(walls)
+
+        if pair_actors:
+            pair_actors = np.concatenate(pair_actors)
+            pair_walls = np.concatenate(pair_walls)
+
+            # Walls grown by each actor's half extents, so the actor sweeps as a point
+            left = self.rects[pair_walls, 0] - half_width[pair_actors]
+            bottom = self.rects[pair_walls, 1] - half_height[pair_actors]
+            right = self.rects[pair_walls, 2] + half_width[pair_actors]
+            top = self.rects[pair_walls, 3] + half_height[pair_actors]
+
+            for _ in range(COLLISION_MAX_SLIDES):
+                hit = self._first_impacts(x, y, dx, dy, pair_actors, left, bottom, right, top)
+                if hit is None:
+                    break
+                actor_index, time, wall_pair, normal_x = hit
+
+                # Move up to the wall, landing exactly on its face
+                x += dx * time
+                y += dy * time
+                on_x = actor_index[normal_x]
+                on_y = actor_index[~normal_x]
+                x[on_x] = np.where(dx[on_x] > 0, left[wall_pair[normal_x]], right[wall_pair[normal_x]])
+                y[on_y] = np.where(dy[on_y] > 0, bottom[wall_pair[~normal_x]], top[wall_pair[~normal_x]])
+
+                # Everything else moves freely; hit actors slide with the rest of their move
+                remaining = np.zeros(len(actors))
+                remaining[actor_index] = 1 - time[actor_index]
+                dx *= remaining
+                dy *= remaining
+                dx[on_x] = 0
+                dy[on_y] = 0
+            else:
+                # Out of slides: whatever is left of the move would go unchecked
+                dx[:] = 0
+                dy[:] = 0
+
+        x += dx
+        y += dy
+        for index, actor in enumerate(actors):
+            actor.position = (float(x[index]), float(y[index]))
+
+    @staticmethod
+    def _first_impacts(x, y, dx, dy, pair_actors, left, bottom, right, top):
+        """
+        Earliest impact of each moving actor against its candidate walls.
+        Returns (actors hit, per-actor time array, pair of each hit, True where the hit face is
+        vertical), or None if no actor hits anything.
+        """
+        px, py = x[pair_actors], y[pair_actors]
+        vx, vy = dx[pair_actors], dy[pair_actors]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Entry and exit times along each axis; a still axis overlaps always or never
+            x_entry = np.where(vx > 0, (left - px) / vx, (right - px) / vx)
+            x_exit = np.where(vx > 0, (right - px) / vx, (left - px) / vx)
+            inside_x = (left < px) & (px < right)
+            x_entry = np.where(vx == 0, np.where(inside_x, -np.inf, np.inf), x_entry)
+            x_exit = np.where(vx == 0, np.inf, x_exit)
+
+            y_entry = np.where(vy > 0, (bottom - py) / vy, (top - py) / vy)
+            y_exit = np.where(vy > 0, (top - py) / vy, (bottom - py) / vy)
+            inside_y = (bottom < py) & (py < top)
+            y_entry = np.where(vy == 0, np.where(inside_y, -np.inf, np.inf), y_entry)
+            y_exit = np.where(vy == 0, np.inf, y_exit)
+
+        entry = np.maximum(x_entry, y_entry)
+        exit_ = np.minimum(x_exit, y_exit)
+
+        # Actors already overlapping a wall (e.g. spawned inside it) may walk out of it
+        overlapping = inside_x & inside_y
+        hits = np.flatnonzero(~overlapping & (entry < exit_) & (entry >= 0) & (entry <= 1))
+        if len(hits) == 0:
+            return None
+
+        # Earliest hit per actor
+        order = hits[np.lexsort((entry[hits], pair_actors[hits]))]
+        actor_index, first = np.unique(pair_actors[order], return_index=True)
+        wall_pair = order[first]
+
+        time = np.ones(len(x))
+        time[actor_index] = entry[wall_pair]
+        return actor_index, time, wall_pair, x_entry[wall_pair] >= y_entry[wall_pair]
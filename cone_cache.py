@@ -0,0 +1,170 @@
+# cone_cache.py
+
+import weakref
+
+import numpy as np
+
+from constants import (
+    CONE_CACHE_POSITION_QUANTUM,
+    CONE_CACHE_ANGLE_QUANTUM,
+    CONE_CACHE_MAX_ROTATION,
+)
+from visibility import VisibilityPolygon
+
+
+class _ConeEntry:
+    def __init__(self, pose_key, angle_key, facing_angle, polygon):
+        self.pose_key = pose_key
+        self.angle_key = angle_key
+        self.facing_angle = facing_angle
+        self.polygon = polygon
+
+
+class ConeCache:
+    """
+    Per-viewer cache of light-cone polygons across frames.
+    Entries are keyed on quantized position, facing angle, cone size and the wall-set version.
+    A viewer that only turned a little gets its cached polygon rotated, re-casting just the newly
+    exposed slice of the cone.
+    """
+
+    def __init__(self):
+        # Entries die with their viewer sprite
+        self.entries = weakref.WeakKeyDictionary()
+
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    def _keys(self, start_x, start_y, facing_angle, cone_length, cone_angle, wall_version):
+        pose_key = (
+            round(start_x / CONE_CACHE_POSITION_QUANTUM),
+            round(start_y / CONE_CACHE_POSITION_QUANTUM),
+            cone_length,
+            cone_angle,
+            wall_version,
+        )
+        angle_key = round((facing_angle % 360) / CONE_CACHE_ANGLE_QUANTUM)
+        return pose_key, angle_key
+
+    def _reuse(self, viewer, facing_angle, cone_angle, pose_key, angle_key, cast_cone):
+        """
+        Returns the viewer's cached polygon (rotated if it turned a little), or None on a miss.
+        """
+        entry = self.entries.get(viewer)
+        if entry is None or entry.pose_key != pose_key:
+            return None
+        if entry.angle_key == angle_key:
+            self.hits += 1
+            return entry.polygon
+
+        rotation = (facing_angle - entry.facing_angle + 180) % 360 - 180
+        if abs(rotation) <= CONE_CACHE_MAX_ROTATION and abs(rotation) < cone_angle:
+            self.partial_hits += 1
+            polygon = self._rotate(entry.polygon, rotation, cast_cone)
+            self.entries[viewer] = _ConeEntry(pose_key, angle_key, facing_angle, polygon)
+            return polygon
+        return None
+
+    def get_cone(self, viewer, start_x, start_y, facing_angle, cone_length, cone_angle,
+                 wall_version, cast_cone):
+        """
+        Returns the viewer's cone polygon, reusing the cached one where possible.
+        cast_cone(start_x, start_y, start_angle, cone_length, cone_angle) casts a cone or a slice.
+        """
+        pose_key, angle_key = self._keys(
+            start_x, start_y, facing_angle, cone_length, cone_angle, wall_version
+        )
+        polygon = self._reuse(viewer, facing_angle, cone_angle, pose_key, angle_key, cast_cone)
+        if polygon is not None:
+            return polygon
+
+        self.misses += 1
+        polygon = cast_cone(start_x, start_y, facing_angle - cone_angle / 2, cone_length, cone_angle)
+        self.entries[viewer] = _ConeEntry(pose_key, angle_key, facing_angle, polygon)
+        return polygon
+
+    def get_cones(self, requests, wall_version, cast_cone, cast_cones):
+        """
+        Batched get_cone. requests is a list of (viewer, start_x, start_y, facing_angle,
+        cone_length, cone_angle); every miss is handed to cast_cones in one call, as a list of
+        (start_x, start_y, facing_angle, cone_length, cone_angle). Returns polygons in order.
+        """
+        polygons = [None] * len(requests)
+        missed = []
+        for index, (viewer, start_x, start_y, facing_angle, cone_length, cone_angle) in enumerate(requests):
+            keys = self._keys(start_x, start_y, facing_angle, cone_length, cone_angle, wall_version)
+            polygons[index] = self._reuse(viewer, facing_angle, cone_angle, *keys, cast_cone)
+            if polygons[index] is None:
+                missed.append((index, keys))
+
+        if missed:
+            self.misses += len(missed)
+            cones = [requests[index][1:] for index, _ in missed]
+            for (index, (pose_key, angle_key)), polygon in zip(missed, cast_cones(cones)):
+                polygons[index] = polygon
+                self.entries[requests[index][0]] = _ConeEntry(
+                    pose_key, angle_key, requests[index][3], polygon
+                )
+        return polygons
+
+    def _rotate(self, polygon, rotation, cast_cone):
+        """
+        Rotates a cached polygon, keeping the overlapping part and casting only the new slice.
+        """
+        cone_angle = polygon.cone_angle
+        start_angle = polygon.start_angle + rotation
+        # Cached boundary points, as offsets from the new start
+        offsets = polygon.angles - rotation
+
+        def cast_slice(slice_start, slice_angle):
+            return cast_cone(
+                polygon.start_x, polygon.start_y, start_angle + slice_start,
+                polygon.cone_length, slice_angle,
+            )
+
+        if rotation > 0:
+            # Turned counter-clockwise: the new slice opens at the end of the cone
+            kept = offsets > 0
+            first = cast_slice(0, 0)
+            last = cast_slice(cone_angle - rotation, rotation)
+            new = last.angles > 0
+            angles = (first.angles, offsets[kept], last.angles[new] + cone_angle - rotation)
+            points = (first.points, polygon.points[kept], last.points[new])
+        else:
+            # Turned clockwise: the new slice opens at the start of the cone
+            kept = offsets < cone_angle
+            first = cast_slice(0, -rotation)
+            last = cast_slice(cone_angle, 0)
+            new = first.angles < -rotation
+            angles = (first.angles[new], offsets[kept], last.angles + cone_angle)
+            points = (first.points[new], polygon.points[kept], last.points)
+
+        angles = np.concatenate(angles)
+        # The rotated polygon must span the same angles a fresh cast would; if the slices did
+        # not line up with the cone's edges, cast the whole cone instead
+        if len(angles) == 0 or not (np.isclose(angles[0], 0) and np.isclose(angles[-1], cone_angle)):
+            return cast_slice(0, cone_angle)
+
+        return VisibilityPolygon(
+            polygon.start_x, polygon.start_y, start_angle, polygon.cone_length, cone_angle,
+            angles, np.concatenate(points),
+        )
+
+    def clear(self):
+        """
+        Forget every cached cone, e.g. when the ray density changes.
+        """
+        self.entries.clear()
+
+    def stats(self):
+        """
+        Returns the hit/miss counters, e.g. for logging.
+        """
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.partial_hits) / lookups if lookups else 0.0,
+        }
@@ -5,31 +5,44 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 SCREEN_TITLE = "Top-Down Shooter Game"
 
+# Simulation constants
+SIMULATION_STEP = 1 / 60  # Seconds of game time advanced per simulation step, independent of the display rate
+MAX_SIMULATION_STEPS = 5  # Most steps run per displayed frame; beyond that the game slows down instead of stalling
+
 # Player constants
 PLAYER_SCALING = 0.2
-PLAYER_MOVEMENT_SPEED = 2
+PLAYER_MOVEMENT_SPEED = 120  # Pixels per second
 PLAYER_HEALTH = 100
-PLAYER_FIRE_RATE = 15  # Frames between shots
+PLAYER_FIRE_RATE = 0.25  # Seconds between shots
 PLAYER_BULLET_DAMAGE = 10
+PLAYER_BULLET_SPEED = 600
 INITIAL_AMMO = 30
 
 # Enemy constants
 ENEMY_SCALING = 0.3
-ENEMY_MOVEMENT_SPEED = 1
+ENEMY_MOVEMENT_SPEED = 180
 ENEMY_HEALTH = 50
 ENEMY_SHOOT_RANGE = 200
 ENEMY_DETECTION_RANGE = 400  # Detection range for enemies
-ENEMY_SHOOT_DELAY = 30  # Frames between shots
+ENEMY_SHOOT_DELAY = 0.5  # Seconds between shots
 ENEMY_BULLET_DAMAGE = 10
-ENEMY_BULLET_SPEED = 5
+ENEMY_BULLET_SPEED = 300
+ENEMY_ARROW_DELAY = 15  # Seconds without firing before an off-screen arrow points at an enemy
 
 # Cone constants
 CONE_ANGLE = 30  # Half-angle in degrees
 CONE_LENGTH = 300
+LIGHT_CONE_MODE = "sweep"  # "sweep" for the exact visibility polygon, "rays" for fixed 1 degree sampling
+VISIBILITY_ARC_STEP = 2  # Degrees between samples along the outer arc of a swept cone
 
 # Ammo pickup constants
 AMMO_PICKUP_AMOUNT = 10
 AMMO_PICKUP_SCALING = 0.1
+AMMO_PICKUP_MERGE_RADIUS = 40  # Ammo dropped this close to an ammo pickup is merged into it
+PICKUP_RADIUS = 5
+PICKUP_CAPS = {'ammo': 24, 'health': 8}  # Most pickups of each kind alive at once
+PICKUP_TTL = {'ammo': 60, 'health': 90}  # Seconds before an uncollected pickup despawns
+AMMO_SPAWN_INTERVAL = 2  # Seconds between random ammo pickups
 
 # World constants
 WORLD_CENTER_X = 0
@@ -40,11 +53,73 @@ SAFE_SPAWN_DISTANCE = 300  # Minimum distance from player to spawn enemies or pi
 # Boss constants
 BOSS_SCALING = 0.3
 BOSS_HEALTH = ENEMY_HEALTH * 10
-BOSS_MOVEMENT_SPEED = 1.5
+BOSS_MOVEMENT_SPEED = 270
 BOSS_SHOOT_RANGE = 300
-BOSS_SHOOT_DELAY = 20  # Boss fires more frequently
+BOSS_SHOOT_DELAY = 1 / 3  # Boss fires more frequently
 BOSS_BULLET_DAMAGE = ENEMY_BULLET_DAMAGE * 2
-BOSS_BULLET_SPEED = 7
+BOSS_BULLET_SPEED = 420
 HEALTH_PICKUP_AMOUNT = 50  # Amount of health restored by a health pickup
+BULLET_TARGETS = {'player': ('enemy', 'boss'), 'enemy': ('player',), 'boss': ('player',)}  # What each owner's bullets hit
+BULLET_CAPACITY = 1024  # Bullets preallocated in the bullet arrays; grows by doubling
+BULLET_DRAW_SEGMENTS = 10  # Triangles per drawn bullet circle; bullets are only a few pixels across
+BULLET_GRID_CELL_SIZE = 64  # Cell size of the per-tick grid pairing bullet paths with the sprites they may hit
+
+
+
+# Spatial index constants
+WALL_GRID_CELL_SIZE = 64  # Cell size of the static wall grid used by ray and line-of-sight queries
+
+# Light cone cache constants
+CONE_CACHE_POSITION_QUANTUM = 0.5  # Viewer movement (pixels) below which a cached cone is reused
+CONE_CACHE_ANGLE_QUANTUM = 0.1  # Viewer rotation (degrees) below which a cached cone is reused
+CONE_CACHE_MAX_ROTATION = 10  # Largest rotation (degrees) patched by re-casting only the exposed slice
+
+# Potentially-visible-set constants
+PVS_CELL_SIZE = 100  # Cell size of the precomputed per-cell wall visibility lists
+PVS_VIEW_RANGE = max(CONE_LENGTH, ENEMY_SHOOT_RANGE, BOSS_SHOOT_RANGE)  # Farthest any cone or shot looks
+
+# Quality governor constants
+FRAME_BUDGET = 1 / 60  # Target seconds of on_update + on_draw work per frame
+QUALITY_SMOOTHING = 0.1  # Weight of the newest frame in the running frame-time average
+QUALITY_DOWNGRADE_FRAMES = 30  # Consecutive over-budget frames before lowering quality
+QUALITY_UPGRADE_FRAMES = 180  # Consecutive frames with headroom before raising quality
+QUALITY_UPGRADE_HEADROOM = 0.7  # Fraction of the budget the average must stay under to raise quality
+QUALITY_DECISION_HISTORY = 50  # Quality changes kept for logging
+
+# Collision constants
+COLLISION_MAX_SLIDES = 3  # Wall impacts resolved per actor per frame before the rest of the move is dropped
+
+# Crowd constants
+CROWD_STEERING = True  # Spread chasing enemies around the player instead of letting them stack up
+CROWD_SEPARATION_RADIUS = 60  # Enemies closer than this (center to center, pixels) push each other apart
+CROWD_SEPARATION_WEIGHT = 1.5  # Strength of a full push relative to the enemy's movement speed
+NEIGHBOR_CELL_SIZE = CROWD_SEPARATION_RADIUS  # Cell size of the per-tick enemy and boss neighbor index
+
+# AI scheduling constants
+AI_LOD_TIERS = (  # (farthest distance from the player, ticks between AI updates) from nearest to farthest
+    (ENEMY_DETECTION_RANGE + 100, 1),  # Engaged, or close enough to engage before its next update
+    (800, 3),  # Wandering near the screen
+    (float('inf'), 8),  # Wandering far off-screen
+)
+AI_LOD_BUDGET = 48  # Most lower-tier enemy AI updates (each with its collision move) per tick
+AI_LOS_BUDGET = 32  # Most enemy line-of-sight checks per tick; enemies left over try again next tick
+
+# Navigation constants
+NAV_CELL_SIZE = 40  # Cell size of the flow field enemies and bosses follow toward the player
+NAV_CLEARANCE = 40  # Cells this close to a wall (about an enemy's half size) are avoided when there is room
+NAV_CLEARANCE_PENALTY = 4  # Cost of crossing a cell that close to a wall relative to an open one
+NAV_RANGE = 2 * ENEMY_DETECTION_RANGE  # Longest path (pixels) the flow field routes; actors beyond head straight in
+
+# Targeting constants
+TARGET_DISTANCE_BAND = 50  # Auto-fire treats targets this close in distance (pixels) as equally near and prefers the weaker one
 
+# Spawn placement constants
+SPAWN_CELL_SIZE = 8  # Cell size of the blocked-cell grid spawn points are tested against
+SPAWN_WALL_CLEARANCE = 50  # Nothing spawns with its center closer than this to a wall (about an enemy's half diagonal)
+SPAWN_SPACING = CROWD_SEPARATION_RADIUS  # Spawns of one batch keep at least this far apart where room allows
+SPAWN_OVERSAMPLE = 4  # Candidate points drawn per spawn still missing in each round
+SPAWN_MAX_ROUNDS = 4  # Rounds of candidates before the spacing is given up on for the rest
 
+# Wave constants
+WAVE_PREFETCH_PER_STEP = 8  # Enemy or boss sprites built per step ahead of the next wave
+WAVE_TRANSITION_FRAMES = 10  # Frames after a wave starts whose times count toward its worst transition frame
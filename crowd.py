@@ -0,0 +1,41 @@
+# crowd.py
+
+import numpy as np
+
+# Stacked points are pushed apart along directions spread by the golden angle
+_GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+
+def separation(index, radius):
+    """
+    (push_x, push_y) for every point of a NeighborIndex: the sum of unit pushes away from each
+    neighbor closer than radius, scaled from 1 when on top of it down to 0 at radius.
+    """
+    n = len(index)
+    i, j, distance = index.pairs_within(radius)
+    dx = index.x[i] - index.x[j]
+    dy = index.y[i] - index.y[j]
+
+    # Points on exactly the same spot still need a direction to split along
+    stacked = distance == 0
+    angle = (i[stacked] + j[stacked]) * _GOLDEN_ANGLE
+    dx[stacked] = np.cos(angle)
+    dy[stacked] = np.sin(angle)
+    distance = np.where(stacked, 1.0, distance)
+
+    strength = (radius - distance) / radius / distance
+    strength[stacked] = 1.0
+    push_x = np.bincount(i, dx * strength, n) - np.bincount(j, dx * strength, n)
+    push_y = np.bincount(i, dy * strength, n) - np.bincount(j, dy * strength, n)
+    return push_x, push_y
+
+
+def steer(change_x, change_y, push_x, push_y, weight, speed):
+    """
+    Blend velocities with weighted separation pushes, keeping each at most speed.
+    """
+    change_x = change_x + push_x * weight * speed
+    change_y = change_y + push_y * weight * speed
+    magnitude = np.hypot(change_x, change_y)
+    scale = np.where(magnitude > speed, speed / np.maximum(magnitude, 1e-12), 1.0)
+    return change_x * scale, change_y * scale
@@ -0,0 +1,32 @@
+# edge_table.py
+
+import itertools
+
+import numpy as np
+
+# Bumped every time a table is built so caches can tell wall sets apart
+_versions = itertools.count(1)
+
+
+class EdgeTable:
+    """
+    Packed x1, y1, x2, y2 rows for every wall edge, plus the index of the owning wall.
+    Built once per wall set so geometry queries never call Wall.get_lines in the frame loop.
+    """
+
+    def __init__(self, wall_list=()):
+        self.walls = list(wall_list)
+        self.version = next(_versions)
+
+        rows = []
+        owners = []
+        for wall_index, wall in enumerate(self.walls):
+            for (x1, y1), (x2, y2) in wall.get_lines():
+                rows.append((x1, y1, x2, y2))
+                owners.append(wall_index)
+
+        self.edges = np.ascontiguousarray(np.array(rows, dtype=float).reshape(-1, 4))
+        self.wall_index = np.array(owners, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.edges)
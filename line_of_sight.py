@@ -0,0 +1,43 @@
+# line_of_sight.py
+
+
+class LineOfSightService:
+    """
+    Answers "is the segment between two points free of walls?" for the whole game,
+    memoizing every answer until the next frame so each pair is tested against the walls once.
+    """
+
+    def __init__(self, wall_grid):
+        self.wall_grid = wall_grid
+        self.memo = {}
+
+        # Counters for the current frame
+        self.hits = 0
+        self.misses = 0
+
+    def begin_frame(self):
+        """
+        Forget last frame's answers; call once per tick before anything moves or shoots.
+        """
+        self.memo.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def is_clear(self, start_x, start_y, end_x, end_y):
+        """
+        Returns True if no wall blocks the segment between the two points.
+        """
+        # Line of sight is symmetric, so both directions share one entry
+        if (start_x, start_y) <= (end_x, end_y):
+            key = (start_x, start_y, end_x, end_y)
+        else:
+            key = (end_x, end_y, start_x, start_y)
+
+        clear = self.memo.get(key)
+        if clear is None:
+            self.misses += 1
+            clear = not self.wall_grid.segment_blocked(*key)
+            self.memo[key] = clear
+        else:
+            self.hits += 1
+        return clear
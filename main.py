@@ -1,20 +1,18 @@
 import os
 import sys
 import arcade
-import random
 import math
 import arcade.gui
-import json
+import time
 from itertools import chain  # Import chain to combine SpriteLists
 
 from constants import *
-from enemy import Enemy
-from boss import Boss  # Import the Boss class
-from player import Player
-from bullet import Bullet
-from ammo_pickup import AmmoPickup
+from world import World, PlayerInput
 from audio import AudioManager
-from wall import Wall
+from visibility import compute_visibility_polygon, cast_ray_fan, compute_cone_polygons
+from cone_cache import ConeCache
+from visibility_engine import VisibilityEngine, Viewer
+from quality_governor import QualityGovernor
 
 if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
     os.chdir(sys._MEIPASS)
@@ -187,6 +185,7 @@ class TopDownShooter(arcade.View):
         self.pressed_keys = set()  # To track currently pressed keys
         self.show_tutorial = True  # Show tutorial text initially
         self.tutorial_timer = 0    # Timer to hide the tutorial text
+        self.show_debug = False    # F3 toggles the frame-time overlay
 
         self.key_w = arcade.Sprite(":resources:images/items/keyBlue.png", scale=0.5)
         self.key_a = arcade.Sprite(":resources:images/items/keyBlue.png", scale=0.5)
@@ -200,17 +199,11 @@ class TopDownShooter(arcade.View):
         self.key_d.center_x, self.key_d.center_y = 450, 350
         self.mouse_icon.center_x, self.mouse_icon.center_y = 600, 350
 
-        # Sprite lists
-        self.player_list = arcade.SpriteList()
-        self.enemy_list = arcade.SpriteList()
-        self.boss_list = arcade.SpriteList()  # New list for bosses
-        self.bullet_list = arcade.SpriteList()
-        self.ammo_pickup_list = arcade.SpriteList()
-        self.health_pickup_list = arcade.SpriteList()  # New list for health pickups
-        self.wall_list = arcade.SpriteList()
+        # The game simulation; this view only draws it and feeds it input
+        self.world = World()
 
-        # Initialize player
-        self.player_sprite = None
+        # Single-pass visibility of walls, pickups and enemies for all viewer cones
+        self.visibility_engine = VisibilityEngine(self.world.line_of_sight)
 
         # Mouse position
         self.mouse_x = 0
@@ -219,34 +212,36 @@ class TopDownShooter(arcade.View):
         # Camera
         self.camera = arcade.Camera(self.window.width, self.window.height)
 
-        # Ammo spawn timer
-        self.ammo_spawn_timer = 0
-
-        # Wave number
-        self.wave_number = 1
+        # Simulation time not yet stepped, and how far drawing lies behind the last step
+        self.accumulator = 0.0
+        self.bullet_time_offset = 0.0
 
         # Audio Manager will be set before setup()
         self.audio_manager = AudioManager()  # Initialize AudioManager
         self.audio_manager.play_game_sound()
 
         # Player death handling
-        self.player_dead = False
         self.death_timer = 0
 
-        # Enemies killed count
-        self.enemies_killed = 0
-
-        # Boss defeated count
-        self.bosses_defeated = 0
-
         # High score (total enemies and bosses defeated)
         self.high_score = 0
 
-        # Flag to check if boss is active
-        self.boss_active = False
-
         # Enable enemy ray casting
-        self.enable_enemy_ray_casting = False
+        self.enable_enemy_ray_casting = True
+
+        # Lit polygon of the player's cone from the last draw, reused for visibility checks
+        self.player_visibility = None
+
+        # Light cones reused across frames while their viewer holds still
+        self.cone_cache = ConeCache()
+
+        # Rendering quality adapted to the measured frame time
+        self.quality_governor = QualityGovernor()
+        self.update_time = 0.0
+
+        # Visible set from the last refresh, and frames since then
+        self.visible_objects = None
+        self.visibility_age = 0
 
     def draw_tutorial_text(self):
         """
@@ -324,21 +319,12 @@ class TopDownShooter(arcade.View):
         # Set background colordddd
         arcade.set_background_color((60, 60, 60, 255))
 
-        # Create the player at the center of the world
-        self.player_sprite = Player(
-            "resources/Images/top_View-removedbg.png",  # Standing texture
-            "resources/Images/Moving1.png",             # First walking frame
-            "resources/Images/Moving2.png",             # Second walking frame
-            PLAYER_SCALING,
-        )
-        self.player_sprite.center_x = WORLD_CENTER_X
-        self.player_sprite.center_y = WORLD_CENTER_Y
-        self.player_list.append(self.player_sprite)
+        self.world.setup("resources/assets/map1.json")
 
-        # Spawn the initial wave of enemies
-        self.spawn_enemies()
-
-        self.load_map("resources/assets/map1.json")
+        # The map load replaced the line-of-sight service and the walls
+        self.visibility_engine = VisibilityEngine(self.world.line_of_sight)
+        self.visibility_engine.set_static("walls", self.world.wall_list)
+        self.visible_objects = None
 
     
     def pause_game(self):
@@ -349,79 +335,6 @@ class TopDownShooter(arcade.View):
     def on_show(self):
         self.window.set_mouse_visible(True)
 
-    def spawn_enemies(self):
-        if self.wave_number % 5 == 0 and not self.boss_active:
-            # Spawn the boss
-            self.spawn_boss()
-            self.boss_active = True
-        else:
-            # Spawn regular enemies
-            num_enemies = self.wave_number
-            for _ in range(num_enemies):
-                enemy_sprite = Enemy(
-                    "resources/Images/enemy.png",          # Standing texture
-                    "resources/Images/enemy.png",          # First walking frame (reused)
-                    "resources/Images/enemy.png",          # Second walking frame (reused)
-                    ENEMY_SCALING,
-                )
-                enemy_sprite.health = ENEMY_HEALTH + (self.wave_number - 1) * 10
-
-                while True:
-                    angle = random.uniform(0, 2 * math.pi)
-                    r = WORLD_RADIUS * math.sqrt(random.uniform(0, 1))
-                    x = WORLD_CENTER_X + r * math.cos(angle)
-                    y = WORLD_CENTER_Y + r * math.sin(angle)
-
-                    distance_to_player = math.hypot(
-                        x - self.player_sprite.center_x, y - self.player_sprite.center_y
-                    )
-                    if distance_to_player >= SAFE_SPAWN_DISTANCE:
-                        break
-
-                enemy_sprite.center_x = x
-                enemy_sprite.center_y = y
-                self.enemy_list.append(enemy_sprite)
-
-    def spawn_boss(self):
-        boss_sprite = Boss(
-            "resources/Images/boss.png",  # Path to the boss image
-            "resources/Images/boss.png",
-            "resources/Images/boss.png",
-            BOSS_SCALING,
-        )
-        boss_sprite.health = BOSS_HEALTH
-        boss_sprite.center_x = WORLD_CENTER_X
-        boss_sprite.center_y = WORLD_CENTER_Y - 400  # Spawn position
-        self.boss_list.append(boss_sprite)
-
-        # Play the boss sound
-        if self.audio_manager:
-            self.audio_manager.play_boss_sound()
-
-    def spawn_ammo_pickup_at(self, x, y):
-        ammo_pickup = AmmoPickup(5, arcade.color.BLUE, x, y)
-        self.ammo_pickup_list.append(ammo_pickup)
-
-    def spawn_health_pickup_at(self, x, y):
-        health_pickup = AmmoPickup(5, arcade.color.GREEN, x, y)
-        self.health_pickup_list.append(health_pickup)
-
-    def spawn_ammo_pickup(self):
-        while True:
-            angle = random.uniform(0, 2 * math.pi)
-            r = WORLD_RADIUS * math.sqrt(random.uniform(0, 1))
-            x = WORLD_CENTER_X + r * math.cos(angle)
-            y = WORLD_CENTER_Y + r * math.sin(angle)
-
-            distance_to_player = math.hypot(
-                x - self.player_sprite.center_x, y - self.player_sprite.center_y
-            )
-            if distance_to_player >= SAFE_SPAWN_DISTANCE:
-                break
-
-        ammo_pickup = AmmoPickup(5, arcade.color.BLUE, x, y)
-        self.ammo_pickup_list.append(ammo_pickup)
-
     def draw_outside_world_background(self):
         
         screen_width, screen_height = self.window.get_size()
@@ -435,6 +348,44 @@ class TopDownShooter(arcade.View):
 
 
     def on_draw(self):
+        draw_start = time.perf_counter()
+
+        # Draw partway between the last two simulation steps so motion stays smooth at any display rate
+        alpha = self.accumulator / SIMULATION_STEP
+        self.bullet_time_offset = (alpha - 1) * SIMULATION_STEP
+        simulated = []
+        for sprite in chain(self.world.player_list, self.world.enemy_list, self.world.boss_list):
+            previous = getattr(sprite, "previous_position", None)
+            if getattr(sprite, "ai_interval", 1) > 1:
+                # Enemies between AI updates are drawn where their last velocity has taken them
+                current = sprite.position
+                simulated.append((sprite, current))
+                time_offset = self.world.time - sprite.ai_moved_at + self.bullet_time_offset
+                sprite.position = (
+                    current[0] + sprite.change_x * time_offset,
+                    current[1] + sprite.change_y * time_offset,
+                )
+            elif previous is not None:
+                current = sprite.position
+                simulated.append((sprite, current))
+                sprite.position = (
+                    previous[0] + (current[0] - previous[0]) * alpha,
+                    previous[1] + (current[1] - previous[1]) * alpha,
+                )
+
+        self.draw_game()
+
+        for sprite, current in simulated:
+            sprite.position = current
+
+        # Adapt quality to the time spent on this frame's update and draw
+        draw_time = time.perf_counter() - draw_start
+        self.world.wave_manager.record_frame(self.update_time + draw_time)
+        if self.quality_governor.record_frame(self.update_time + draw_time):
+            # Cached cones were cast at the old ray density
+            self.cone_cache.clear()
+
+    def draw_game(self):
         arcade.start_render()
         self.camera.use()
 
@@ -464,49 +415,33 @@ class TopDownShooter(arcade.View):
         )
 
         # Draw flashlight effect for the player
-        self.draw_light_cone(
-            self.player_sprite.center_x,
-            self.player_sprite.center_y,
-            self.player_sprite.angle,
+        self.player_visibility = self.draw_light_cone(
+            self.world.player_sprite.center_x,
+            self.world.player_sprite.center_y,
+            self.world.player_sprite.angle,
             CONE_LENGTH,
             CONE_ANGLE,
-            (180, 180, 180, 100)  # Light yellow with transparency
+            (180, 180, 180, 100),  # Light yellow with transparency
+            self.world.player_sprite,
         )
 
         # Conditionally draw flashlight effects for all enemies
         if self.enable_enemy_ray_casting:
-            for enemy in self.enemy_list:
-                self.draw_light_cone(
-                    enemy.center_x,
-                    enemy.center_y,
-                    enemy.angle,
-                    ENEMY_SHOOT_RANGE,
-                    CONE_ANGLE,
-                    (255, 0, 0, 50),  # Light red with transparency
-                )
-            for boss in self.boss_list:
-                self.draw_light_cone(
-                    boss.center_x,
-                    boss.center_y,
-                    boss.angle,
-                    BOSS_SHOOT_RANGE,
-                    CONE_ANGLE,
-                    (128, 0, 128, 50),  # Light purple with transparency
-                )
+            self.draw_enemy_light_cones()
 
         # Draw visible objects in cones
         self.draw_visible_objects()
 
         # Draw all sprites and HUD elements on the top-most layer
-        self.player_list.draw()
-        self.enemy_list.draw()
-        self.boss_list.draw()
-        self.bullet_list.draw()
-        self.ammo_pickup_list.draw()
-        self.health_pickup_list.draw()
+        self.world.player_list.draw()
+        self.world.enemy_list.draw()
+        self.world.boss_list.draw()
+        self.world.bullets.draw(self.bullet_time_offset)
+        self.world.ammo_pickup_list.draw()
+        self.world.health_pickup_list.draw()
         self.draw_hud()
         self.draw_enemy_arrows()
-        if self.wave_number == 1 and self.show_tutorial:
+        if self.world.wave_number == 1 and self.show_tutorial:
             self.draw_tutorial_text()
 
     def draw_dark_overlay(self):
@@ -522,14 +457,21 @@ class TopDownShooter(arcade.View):
             (0, 0, 0, 150)  # Dark overlay with alpha for transparency
         )
 
-    def draw_light_cone(self, start_x, start_y, facing_angle, cone_length, cone_angle, color):
-        step_angle = 1  # Adjust for smoother rendering
-        ray_points = []
-
-        for angle_offset in range(-cone_angle // 2, cone_angle // 2 + 1, step_angle):
-            angle = facing_angle + angle_offset
-            end_point = self.cast_ray(start_x, start_y, angle, cone_length, self.wall_list)
-            ray_points.append(end_point)
+    def draw_light_cone(self, start_x, start_y, facing_angle, cone_length, cone_angle, color, viewer=None):
+        """
+        Draw a flashlight cone clipped by walls, reusing the viewer's cached cone when given.
+        Returns the exact lit polygon in "sweep" mode so visibility checks can reuse it, else None.
+        """
+        if viewer is not None:
+            polygon = self.cone_cache.get_cone(
+                viewer, start_x, start_y, facing_angle, cone_length, cone_angle,
+                self.world.wall_edges.version, self.cast_light_cone,
+            )
+        else:
+            polygon = self.cast_light_cone(
+                start_x, start_y, facing_angle - cone_angle / 2, cone_length, cone_angle
+            )
+        ray_points = polygon.points.tolist()
 
         # Draw the flashlight cone with transparency
         for i in range(len(ray_points) - 1):
@@ -540,182 +482,160 @@ class TopDownShooter(arcade.View):
                 color
             )
 
+        return polygon if LIGHT_CONE_MODE == "sweep" else None
+
+    def draw_enemy_light_cones(self):
+        """
+        Draw the cones of every on-screen enemy and boss, solved together and drawn in one batch.
+        """
+        left, bottom = self.camera.position[0], self.camera.position[1]
+        right, top = left + self.window.width, bottom + self.window.height
+        level = self.quality_governor.level
+        cone_range = level.enemy_cone_range
+
+        requests = []
+        colors = []
+        for sprites, cone_length, color in (
+            (self.world.enemy_list, ENEMY_SHOOT_RANGE, (255, 0, 0, 50)),  # Light red with transparency
+            (self.world.boss_list, BOSS_SHOOT_RANGE, (128, 0, 128, 50)),  # Light purple with transparency
+        ):
+            for sprite in sprites:
+                # Skip cones that cannot reach the screen
+                gap_x = max(left - sprite.center_x, 0, sprite.center_x - right)
+                gap_y = max(bottom - sprite.center_y, 0, sprite.center_y - top)
+                if gap_x * gap_x + gap_y * gap_y >= cone_length * cone_length:
+                    continue
+                # Skip cones beyond the current quality level's range
+                if math.hypot(
+                    sprite.center_x - self.world.player_sprite.center_x,
+                    sprite.center_y - self.world.player_sprite.center_y,
+                ) > cone_range:
+                    continue
+                requests.append(
+                    (sprite, sprite.center_x, sprite.center_y, sprite.angle, cone_length, CONE_ANGLE)
+                )
+                colors.append(color)
+        if not requests:
+            return
+
+        polygons = self.cone_cache.get_cones(
+            requests, self.world.wall_edges.version, self.cast_light_cone,
+            lambda cones: compute_cone_polygons(
+                cones, self.world.wall_queries, LIGHT_CONE_MODE, level.step_angle, level.arc_step
+            ),
+        )
+
+        # One triangle strip for all fans: origin and boundary alternate, and fans are
+        # joined with degenerate triangles
+        points = []
+        point_colors = []
+        for polygon, color in zip(polygons, colors):
+            origin = (polygon.start_x, polygon.start_y)
+            fan = []
+            for point in polygon.points.tolist():
+                fan.append(origin)
+                fan.append(point)
+            if points:
+                points.extend((points[-1], fan[0]))
+                point_colors.extend((point_colors[-1], color))
+            points.extend(fan)
+            point_colors.extend([color] * len(fan))
+
+        arcade.create_triangles_filled_with_colors(points, point_colors).draw()
+
+    def cast_light_cone(self, start_x, start_y, start_angle, cone_length, cone_angle):
+        """
+        Compute the lit polygon of a cone spanning cone_angle degrees from start_angle,
+        at the ray density of the current quality level.
+        """
+        level = self.quality_governor.level
+        if LIGHT_CONE_MODE == "sweep":
+            return compute_visibility_polygon(
+                start_x, start_y, start_angle + cone_angle / 2, cone_length, cone_angle, self.world.wall_queries,
+                level.arc_step,
+            )
+        return cast_ray_fan(
+            start_x, start_y, start_angle, cone_length, cone_angle, self.world.wall_queries, level.step_angle
+        )
+
     def draw_visible_objects(self):
         """
         Draw visible objects (including walls) dynamically based on visibility.
+        The visible set is refreshed every visibility_interval frames of the current quality level.
         """
-        visible_objects = self.get_visible_objects()
+        self.visibility_age += 1
+        if self.visible_objects is None or self.visibility_age >= self.quality_governor.level.visibility_interval:
+            self.visible_objects = self.get_visible_objects()
+            self.visibility_age = 0
+        visible_objects = self.visible_objects
 
         # Highlight and draw visible walls above the overlay
-        for obj in visible_objects:
-            if obj in self.wall_list:
-                obj.color = arcade.color.WHITE  # Highlight visible walls
-            obj.draw()
+        for wall in visible_objects.by_category["walls"]:
+            wall.color = arcade.color.WHITE  # Highlight visible walls
+            wall.draw()
+        # Pickups and enemies are drawn by their sprite lists on the top layer; drawing the visible
+        # ones one by one here as well would give each newly spawned sprite its own GPU list on sight
 
         # Draw invisible walls (dimmed) below the overlay
-        for wall in self.wall_list:
+        for wall in self.world.wall_list:
             if wall not in visible_objects:
                 wall.color = arcade.color.GRAY  # Dim invisible walls
                 wall.draw()
 
     def get_visible_objects(self):
-        visible_objects = []
-
-        # Check objects within the player's cone
-        visible_objects.extend(self.get_objects_in_cone(
-            self.player_sprite.center_x,
-            self.player_sprite.center_y,
-            self.player_sprite.angle,
-            CONE_LENGTH,
-            CONE_ANGLE
-        ))
-
-        # Check objects within each enemy's cone
-        for enemy in self.enemy_list:
-            visible_objects.extend(self.get_objects_in_cone(
-                enemy.center_x,
-                enemy.center_y,
-                enemy.angle,
-                ENEMY_SHOOT_RANGE,
-                CONE_ANGLE
-            ))
-
-        # Check objects within each boss's cone
-        for boss in self.boss_list:
-            visible_objects.extend(self.get_objects_in_cone(
-                boss.center_x,
-                boss.center_y,
-                boss.angle,
-                BOSS_SHOOT_RANGE,
-                CONE_ANGLE
-            ))
-
-        return visible_objects
-
-    def get_objects_in_cone(self, start_x, start_y, facing_angle, cone_length, cone_angle):
-        visible_objects = []
-
-        # Combine all relevant sprite lists into a single iterable
-        all_objects = list(self.wall_list) + list(self.ammo_pickup_list) + list(self.health_pickup_list) + list(self.enemy_list) + list(self.boss_list)
-
-        for obj in all_objects:
-            if self.is_object_visible_in_cone(start_x, start_y, facing_angle, obj, cone_length, cone_angle):
-                visible_objects.append(obj)
-
-        return visible_objects
-
-    def has_line_of_sight(self, shooter, target, wall_list):
-        """
-        Check if there is a clear line of sight between shooter and target, unobstructed by walls.
-        """
-        ray_line = [(shooter.center_x, shooter.center_y), (target.center_x, target.center_y)]
-        for wall in wall_list:
-            for wall_line in wall.get_lines():
-                if self.get_line_intersection(ray_line, wall_line):
-                    return False
-        return True
-
-    def is_object_visible_in_cone(self, start_x, start_y, facing_angle, obj, cone_length, cone_angle):
         """
-        Check if an object is visible within a cone.
-        """
-        dx = obj.center_x - start_x
-        dy = obj.center_y - start_y
-        distance = math.hypot(dx, dy)
-        angle_to_object = math.degrees(math.atan2(dy, dx))
-        angle_difference = abs((angle_to_object - facing_angle + 180) % 360 - 180)
-
-        # Check if the object is within the cone's range and angle
-        if distance < cone_length and angle_difference < cone_angle / 2:
-            # Ensure the object is not obscured by a wall
-            return self.has_line_of_sight_to_point(start_x, start_y, obj.center_x, obj.center_y)
-        return False
-
-    def has_line_of_sight_to_point(self, start_x, start_y, end_x, end_y):
+        Returns the VisibleSet of everything inside the player's, enemies' and bosses' cones.
         """
-        Check if there is a clear line of sight to a point (end_x, end_y) from (start_x, start_y).
-        """
-        ray_line = [(start_x, start_y), (end_x, end_y)]
-
-        # Check for intersection with walls
-        for wall in self.wall_list:
-            for wall_line in wall.get_lines():
-                if self.get_line_intersection(ray_line, wall_line):
-                    return False
+        # The player's cone reuses the lit polygon from draw_light_cone when there is one
+        viewers = [Viewer(
+            self.world.player_sprite.center_x,
+            self.world.player_sprite.center_y,
+            self.world.player_sprite.angle,
+            CONE_LENGTH,
+            CONE_ANGLE,
+            self.player_visibility,
+        )]
+        viewers.extend(
+            Viewer(enemy.center_x, enemy.center_y, enemy.angle, ENEMY_SHOOT_RANGE, CONE_ANGLE)
+            for enemy in self.world.enemy_list
+        )
+        viewers.extend(
+            Viewer(boss.center_x, boss.center_y, boss.angle, BOSS_SHOOT_RANGE, CONE_ANGLE)
+            for boss in self.world.boss_list
+        )
 
-        return True
+        return self.visibility_engine.compute(viewers, {
+            "walls": self.world.wall_list,
+            "pickups": self.world.pickups.in_rect(
+                self.camera.position[0], self.camera.position[1],
+                self.camera.position[0] + self.window.width, self.camera.position[1] + self.window.height,
+            ),
+            "enemies": list(chain(self.world.enemy_list, self.world.boss_list)),
+        })
 
-    def get_line_intersection(self, line1, line2):
-        """
-        Finds the intersection point of two lines if it exists.
-        Each line is defined as [(x1, y1), (x2, y2)].
-        Returns the intersection point (x, y) or None if no intersection exists.
-        """
-        x1, y1 = line1[0]
-        x2, y2 = line1[1]
-        x3, y3 = line2[0]
-        x4, y4 = line2[1]
-
-        denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
-        if denom == 0:
-            return None  # Lines are parallel or coincident
-
-        intersect_x = ((x1 * y2 - y1 * x2) * (x3 - x4) - (x1 - x2) * (x3 * y4 - y3 * x4)) / denom
-        intersect_y = ((x1 * y2 - y1 * x2) * (y3 - y4) - (y1 - y2) * (x3 * y4 - y3 * x4)) / denom
-
-        # Check if the intersection point is within both line segments
-        if (
-            min(x1, x2) <= intersect_x <= max(x1, x2)
-            and min(y1, y2) <= intersect_y <= max(y1, y2)
-            and min(x3, x4) <= intersect_x <= max(x3, x4)
-            and min(y3, y4) <= intersect_y <= max(y3, y4)
-        ):
-            return (intersect_x, intersect_y)
-
-        return None  # No valid intersection within the segments
+    def draw_enemy_arrows(self):
+        # Check if time since last fire exceeds 15 seconds
+        targets = [
+            enemy for enemy in chain(self.world.enemy_list, self.world.boss_list)
+            if enemy.time_since_last_fire >= ENEMY_ARROW_DELAY
+        ]
 
-    def cast_ray(self, start_x, start_y, angle, max_length, wall_list):
-        """
-        Cast a ray from (start_x, start_y) in the given angle up to max_length, stopping at walls.
-        Returns the endpoint of the ray.
-        """
-        end_x = start_x + math.cos(math.radians(angle)) * max_length
-        end_y = start_y + math.sin(math.radians(angle)) * max_length
-
-        ray_line = [(start_x, start_y), (end_x, end_y)]
-        closest_distance = max_length
-        closest_point = (end_x, end_y)
-
-        # Check for intersection with walls
-        for wall in wall_list:
-            for wall_line in wall.get_lines():  # Wall defines its edges as line segments
-                intersection = self.get_line_intersection(ray_line, wall_line)
-                if intersection:
-                    distance = math.hypot(intersection[0] - start_x, intersection[1] - start_y)
-                    if distance < closest_distance:
-                        closest_distance = distance
-                        closest_point = intersection
-
-        # Ensure the ray stops exactly at the wall boundary
-        if closest_distance < max_length:
-            end_x = start_x + math.cos(math.radians(angle)) * closest_distance
-            end_y = start_y + math.sin(math.radians(angle)) * closest_distance
-
-        return (end_x, end_y)
+        # At lower quality levels only the nearest enemies get an arrow
+        max_arrows = self.quality_governor.level.max_arrows
+        if len(targets) > max_arrows:
+            targets.sort(key=lambda enemy: math.hypot(
+                enemy.center_x - self.world.player_sprite.center_x,
+                enemy.center_y - self.world.player_sprite.center_y,
+            ))
+            targets = targets[:int(max_arrows)]
 
-    def draw_enemy_arrows(self):
-        for enemy in self.enemy_list:
-            # Check if time since last fire exceeds 15 seconds (assuming 60 FPS)
-            if enemy.time_since_last_fire >= 15 * 60:
-                self.draw_arrow_towards_enemy(enemy)
-        for boss in self.boss_list:
-            if boss.time_since_last_fire >= 15 * 60:
-                self.draw_arrow_towards_enemy(boss)
+        for enemy in targets:
+            self.draw_arrow_towards_enemy(enemy)
 
     def draw_arrow_towards_enemy(self, enemy):
         # Calculate the direction vector from the player to the enemy
-        dx = enemy.center_x - self.player_sprite.center_x
-        dy = enemy.center_y - self.player_sprite.center_y
+        dx = enemy.center_x - self.world.player_sprite.center_x
+        dy = enemy.center_y - self.world.player_sprite.center_y
         distance = math.hypot(dx, dy)
 
         if distance == 0:
@@ -775,28 +695,9 @@ class TopDownShooter(arcade.View):
                 x = center_x - (height / 2) / tan_theta
         return x, y
 
-    def load_map(self, map_file):
-        # Clear existing walls
-        self.wall_list = arcade.SpriteList()
-
-        # Load the map data
-        with open(map_file, "r") as f:
-            map_data = json.load(f)
-
-        for wall_data in map_data["walls"]:
-            x, y = wall_data["x"], wall_data["y"]
-            width, height = wall_data["width"], wall_data["height"]
-
-            # Check if the wall is within the circular world boundary
-            dx = x - WORLD_CENTER_X
-            dy = y - WORLD_CENTER_Y
-            if math.hypot(dx, dy) + max(width, height) / 2 <= WORLD_RADIUS:
-                wall = Wall(width, height, arcade.color.GRAY, x, y)
-                self.wall_list.append(wall)
-
     def draw_hud(self):
         # Draw player health bar
-        health_percentage = self.player_sprite.health / PLAYER_HEALTH
+        health_percentage = self.world.player_sprite.health / PLAYER_HEALTH
         health_bar_width = 200 * health_percentage
         arcade.draw_rectangle_filled(
             self.camera.position[0] + health_bar_width / 2 + 10,
@@ -806,7 +707,7 @@ class TopDownShooter(arcade.View):
             arcade.color.RED,
         )
         # Draw health text
-        health_text = f"Health: {self.player_sprite.health}/{PLAYER_HEALTH}"
+        health_text = f"Health: {self.world.player_sprite.health}/{PLAYER_HEALTH}"
         arcade.draw_text(
             health_text,
             self.camera.position[0] + 10,
@@ -816,7 +717,7 @@ class TopDownShooter(arcade.View):
         )
 
         # Draw ammo count
-        ammo_text = f"Ammo: {self.player_sprite.ammo}"
+        ammo_text = f"Ammo: {self.world.player_sprite.ammo}"
         arcade.draw_text(
             ammo_text,
             self.camera.position[0] + 10,
@@ -826,7 +727,7 @@ class TopDownShooter(arcade.View):
         )
 
         # Draw wave number
-        wave_text = f"Wave: {self.wave_number}"
+        wave_text = f"Wave: {self.world.wave_number}"
         arcade.draw_text(
             wave_text,
             self.camera.position[0] + self.window.width - 100,
@@ -836,41 +737,70 @@ class TopDownShooter(arcade.View):
             anchor_x="center",
         )
 
+        # Draw the slowest frame seen around a wave start
+        if self.show_debug:
+            worst = self.world.wave_manager.worst_transition()
+            debug_text = "Worst wave start: none yet"
+            if worst is not None:
+                debug_text = f"Worst wave start: {1000 * worst[1]:.1f} ms (wave {worst[0]})"
+            arcade.draw_text(
+                debug_text,
+                self.camera.position[0] + 10,
+                self.camera.position[1] + self.window.height - 80,
+                arcade.color.WHITE,
+                14,
+            )
+
     def on_update(self, delta_time):
-        if self.wave_number == 1 and self.show_tutorial:
+        update_start = time.perf_counter()
+
+        # Advance the simulation in fixed steps, however long the displayed frame took
+        self.accumulator += min(delta_time, SIMULATION_STEP * MAX_SIMULATION_STEPS)
+        while self.accumulator >= SIMULATION_STEP:
+            self.store_previous_positions()
+            self.update_game(SIMULATION_STEP)
+            self.accumulator -= SIMULATION_STEP
+            if self.window.current_view is not self:
+                break  # Paused or game over
+
+        self.update_camera()
+        self.update_time = time.perf_counter() - update_start
+
+    def store_previous_positions(self):
+        """
+        Remember where every moving sprite was before a step, for interpolated drawing.
+        """
+        for sprite in chain(self.world.player_list, self.world.enemy_list, self.world.boss_list):
+            sprite.previous_position = sprite.position
+
+    def update_game(self, delta_time):
+        """
+        Step the world by delta_time seconds with the current input and play the sounds it asks for.
+        """
+        if self.world.wave_number == 1 and self.show_tutorial:
             self.tutorial_timer += delta_time
             if self.tutorial_timer > 11:  # Hide tutorial after 10 seconds
                 self.show_tutorial = False
-        if self.player_dead:
-            # Stop boss sound if player dies
+
+        self.world.step(delta_time, self.player_input())
+        for event in self.world.drain_events():
             if self.audio_manager:
-                self.audio_manager.stop_boss_sound()
+                getattr(self.audio_manager, event)()
+
+        if self.world.player_dead:
             # Increment death timer
             self.death_timer += delta_time
             if self.death_timer >= 3.0:
                 # Calculate high score
-                self.high_score = self.enemies_killed + self.bosses_defeated * 50
+                self.high_score = self.world.high_score()
                 # Switch to game over view, passing audio_manager
                 game_over_view = GameOverView(self.high_score, self.audio_manager)
                 self.window.show_view(game_over_view)
-            return
-
-        # Update sprites
-        self.player_list.update()
-        self.enemy_list.update()
-        self.boss_list.update()
-        self.bullet_list.update()
-        self.ammo_pickup_list.update()
-        self.health_pickup_list.update()
-
-        # Check for collisions with walls
-        if arcade.check_for_collision_with_list(self.player_sprite, self.wall_list):
-            self.player_sprite.change_x = 0
-            self.player_sprite.change_y = 0
 
+    def update_camera(self):
         # Update camera to follow player, constrained within the world circle
-        cam_x = self.player_sprite.center_x - self.window.width / 2
-        cam_y = self.player_sprite.center_y - self.window.height / 2
+        cam_x = self.world.player_sprite.center_x - self.window.width / 2
+        cam_y = self.world.player_sprite.center_y - self.window.height / 2
 
         dx = cam_x + self.window.width / 2 - WORLD_CENTER_X
         dy = cam_y + self.window.height / 2 - WORLD_CENTER_Y
@@ -884,225 +814,40 @@ class TopDownShooter(arcade.View):
 
         self.camera.move_to((cam_x, cam_y), 0.1)
 
-        # Smoothly rotate the player to face the mouse pointer
-        target_angle = math.degrees(
-            math.atan2(
-                self.mouse_y - self.player_sprite.center_y,
-                self.mouse_x - self.player_sprite.center_x,
-            )
-        )
-        current_angle = self.player_sprite.angle
-
-        # Calculate the shortest rotation direction
-        angle_diff = (target_angle - current_angle + 180) % 360 - 180
-
-        # Set a rotation speed
-        rotation_speed = 300 * delta_time  # Degrees per second
-
-        # Update the angle with a clamped rotation
-        if abs(angle_diff) < rotation_speed:
-            self.player_sprite.angle = target_angle
-        else:
-            self.player_sprite.angle += rotation_speed * (1 if angle_diff > 0 else -1)
-
-        # Keep player within world circle
-        self.keep_sprite_within_world(self.player_sprite)
-
-        # Spawn ammo pickups
-        self.ammo_spawn_timer += 1
-        if self.ammo_spawn_timer >= 120:
-            self.spawn_ammo_pickup()
-            self.ammo_spawn_timer = 0
-
-        # Handle bullets
-        self.handle_bullets()
-
-        # Handle enemies
-        self.handle_enemies()
-
-        # Handle bosses
-        self.handle_bosses()
-
-        # Handle player shooting
-        self.handle_player_shooting()
-
-        # Handle pickups
-        self.handle_pickups()
-
-        # Handle player walking sound
-        if self.audio_manager:
-            if self.player_sprite.change_x != 0 or self.player_sprite.change_y != 0:
-                self.audio_manager.play_player_walk_sound()
-            else:
-                self.audio_manager.stop_player_walk_sound()
-
-        # Check for wave completion
-        if not self.enemy_list and not self.boss_list:
-            self.wave_number += 1
-            self.boss_active = False
-            self.spawn_enemies()
-
-    def keep_sprite_within_world(self, sprite):
-        dx = sprite.center_x - WORLD_CENTER_X
-        dy = sprite.center_y - WORLD_CENTER_Y
-        distance = math.hypot(dx, dy)
-        if distance > WORLD_RADIUS:
-            angle = math.atan2(dy, dx)
-            sprite.center_x = WORLD_CENTER_X + WORLD_RADIUS * math.cos(angle)
-            sprite.center_y = WORLD_CENTER_Y + WORLD_RADIUS * math.sin(angle)
-
-    def handle_bullets(self):
-        for bullet in self.bullet_list:
-            # Remove bullets that leave the world boundary
-            dx = bullet.center_x - WORLD_CENTER_X
-            dy = bullet.center_y - WORLD_CENTER_Y
-            distance = math.hypot(dx, dy)
-            if distance > WORLD_RADIUS:
-                bullet.remove_from_sprite_lists()
-                continue
-
-            # Check if the bullet hits a wall
-            walls_hit = arcade.check_for_collision_with_list(bullet, self.wall_list)
-            if walls_hit:
-                bullet.remove_from_sprite_lists()
-                continue
-
-            if bullet.owner == 'player':
-                hit_list = arcade.check_for_collision_with_list(bullet, self.enemy_list)
-                hit_list += arcade.check_for_collision_with_list(bullet, self.boss_list)
-                for target in hit_list:
-                    if isinstance(target, Enemy):
-                        target.health -= PLAYER_BULLET_DAMAGE
-                        bullet.remove_from_sprite_lists()
-                        if target.health <= 0:
-                            self.enemies_killed += 1
-                            # Drop health pack if player's health is below 20
-                            if self.player_sprite.health < 20:
-                                self.spawn_health_pickup_at(target.center_x, target.center_y)
-                            else:
-                                self.spawn_ammo_pickup_at(target.center_x, target.center_y)
-                            target.remove_from_sprite_lists()
-                            if self.audio_manager:
-                                self.audio_manager.play_enemy_die_sound()
-                        else:
-                            # Play player hit enemy sound
-                            if self.audio_manager:
-                                self.audio_manager.play_player_kill_enemy_sound()
-                        break  # Only one collision per bullet
-
-                    elif isinstance(target, Boss):
-                        target.health -= PLAYER_BULLET_DAMAGE
-                        bullet.remove_from_sprite_lists()
-                        if target.health <= 0:
-                            self.bosses_defeated += 1
-                            # Restore player's health to full
-                            self.player_sprite.health = PLAYER_HEALTH
-                            target.remove_from_sprite_lists()
-                            if self.audio_manager:
-                                self.audio_manager.play_enemy_die_sound()
-                                self.audio_manager.stop_boss_sound()  # Stop boss sound
-                        else:
-                            # Play player hit boss sound
-                            if self.audio_manager:
-                                self.audio_manager.play_player_kill_enemy_sound()
-                        break  # Only one collision per bullet
-            elif bullet.owner == 'enemy':
-                if arcade.check_for_collision(bullet, self.player_sprite):
-                    self.player_sprite.health -= ENEMY_BULLET_DAMAGE
-                    bullet.remove_from_sprite_lists()
-                    if self.player_sprite.health <= 0:
-                        self.player_sprite.texture = self.player_sprite.dead_texture
-                        if self.audio_manager:
-                            self.audio_manager.stop_game_sound()
-                            self.audio_manager.stop_player_walk_sound()
-                            self.audio_manager.stop_enemy_near_player_sound()
-                            self.audio_manager.play_player_die_sound()
-                            self.audio_manager.stop_boss_sound()
-                        self.player_dead = True
-                        self.death_timer = 0
-                        # self.player_sprite.remove_from_sprite_lists()
-                        break
-            elif bullet.owner == 'boss':
-                if arcade.check_for_collision(bullet, self.player_sprite):
-                    self.player_sprite.health -= BOSS_BULLET_DAMAGE
-                    bullet.remove_from_sprite_lists()
-                    if self.player_sprite.health <= 0:
-                        self.player_sprite.texture = self.player_sprite.dead_texture
-                        if self.audio_manager:
-                            self.audio_manager.stop_game_sound()
-                            self.audio_manager.stop_player_walk_sound()
-                            self.audio_manager.stop_enemy_near_player_sound()
-                            self.audio_manager.play_player_die_sound()
-                            self.audio_manager.stop_boss_sound()
-                        self.player_dead = True
-                        self.death_timer = 0
-                        # self.player_sprite.remove_from_sprite_lists()
-                        break
-
-    def handle_player_shooting(self):
-        if self.player_sprite.shoot_timer > 0:
-            self.player_sprite.shoot_timer -= 1
-
-        # Combine enemy and boss lists into a single iterable
-        targets = chain(self.enemy_list, self.boss_list)
-
-        for target in targets:
-            if self.is_within_cone(
-                self.player_sprite,
-                target.center_x,
-                target.center_y,
-                self.player_sprite.angle,
-                CONE_LENGTH,
-                CONE_ANGLE,
-            ) and self.has_line_of_sight(self.player_sprite, target, self.wall_list):
-                if self.player_sprite.ammo > 0 and self.player_sprite.shoot_timer <= 0:
-                    bullet = Bullet(5, arcade.color.YELLOW, 'player', 10)
-                    bullet.center_x = self.player_sprite.center_x
-                    bullet.center_y = self.player_sprite.center_y
-                    bullet.angle = self.player_sprite.angle
-                    bullet.change_x = math.cos(math.radians(bullet.angle)) * bullet.speed
-                    bullet.change_y = math.sin(math.radians(bullet.angle)) * bullet.speed
-                    self.bullet_list.append(bullet)
-                    self.player_sprite.shoot_timer = PLAYER_FIRE_RATE
-                    self.player_sprite.ammo -= 1
-                    break  # Shoot only once per update
-
-    def is_within_cone(self, sprite, target_x, target_y, facing_angle, cone_length, cone_angle):
-        dx = target_x - sprite.center_x
-        dy = target_y - sprite.center_y
-        distance = math.hypot(dx, dy)
-        angle_to_target = math.degrees(math.atan2(dy, dx))
-        angle_difference = abs((angle_to_target - facing_angle + 180) % 360 - 180)
-        return distance < cone_length and angle_difference < (cone_angle / 2)
-
     def on_key_press(self, key, modifiers):
 
         self.pressed_keys.add(key)
-        self.update_movement()
 
         # Pause the game when ESC is pressed
         if key == arcade.key.ESCAPE:
             self.pause_game()
 
+        # Toggle the frame-time overlay when F3 is pressed
+        if key == arcade.key.F3:
+            self.show_debug = not self.show_debug
+
     def on_key_release(self, key, modifiers):
         if key in self.pressed_keys:
             self.pressed_keys.remove(key)
-        self.update_movement()
 
-    def update_movement(self):
-        # Reset movement
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
+    def player_input(self):
+        """
+        The held movement keys and the mouse position as input for the next world step.
+        """
+        move_x = 0
+        move_y = 0
 
         # Check for movement keys in the set
         if arcade.key.UP in self.pressed_keys or arcade.key.W in self.pressed_keys:
-            self.player_sprite.change_y = PLAYER_MOVEMENT_SPEED
+            move_y = 1
         if arcade.key.DOWN in self.pressed_keys or arcade.key.S in self.pressed_keys:
-            self.player_sprite.change_y = -PLAYER_MOVEMENT_SPEED
+            move_y = -1
         if arcade.key.LEFT in self.pressed_keys or arcade.key.A in self.pressed_keys:
-            self.player_sprite.change_x = -PLAYER_MOVEMENT_SPEED
+            move_x = -1
         if arcade.key.RIGHT in self.pressed_keys or arcade.key.D in self.pressed_keys:
-            self.player_sprite.change_x = PLAYER_MOVEMENT_SPEED
+            move_x = 1
+
+        return PlayerInput(move_x, move_y, self.mouse_x, self.mouse_y)
 
     def on_mouse_motion(self, x, y, dx, dy):
         self.mouse_x = x + self.camera.position[0]
@@ -1111,156 +856,6 @@ class TopDownShooter(arcade.View):
     def on_resize(self, width, height):
         self.camera.resize(int(width), int(height))
 
-    def handle_enemies(self):
-        enemy_near_player = False
-        for enemy in self.enemy_list:
-            # Keep enemy within world circle
-            self.keep_sprite_within_world(enemy)
-
-            # Handle collision with walls
-            enemy.handle_collision(self.wall_list)
-
-            distance_to_player = arcade.get_distance_between_sprites(enemy, self.player_sprite)
-
-            if distance_to_player <= ENEMY_DETECTION_RANGE:
-                enemy_near_player = True  # At least one enemy is near
-                # Enemy detects player, follows the player
-                dx = self.player_sprite.center_x - enemy.center_x
-                dy = self.player_sprite.center_y - enemy.center_y
-                enemy.angle = math.degrees(math.atan2(dy, dx))
-
-                if distance_to_player > ENEMY_SHOOT_RANGE:
-                    # Move towards player
-                    enemy.change_x = ENEMY_MOVEMENT_SPEED * math.cos(math.radians(enemy.angle))
-                    enemy.change_y = ENEMY_MOVEMENT_SPEED * math.sin(math.radians(enemy.angle))
-                else:
-                    # Stop movement
-                    enemy.change_x = 0
-                    enemy.change_y = 0
-
-                    # Shoot at player
-                    if enemy.shoot_timer <= 0:
-                        if self.is_within_cone(
-                            enemy,
-                            self.player_sprite.center_x,
-                            self.player_sprite.center_y,
-                            enemy.angle,
-                            ENEMY_SHOOT_RANGE,
-                            CONE_ANGLE,
-                        ) and self.has_line_of_sight(enemy, self.player_sprite, self.wall_list):
-                            bullet = Bullet(5, arcade.color.RED, 'enemy', ENEMY_BULLET_SPEED)
-                            bullet.center_x = enemy.center_x
-                            bullet.center_y = enemy.center_y
-                            bullet.angle = enemy.angle
-                            bullet.change_x = math.cos(math.radians(bullet.angle)) * bullet.speed
-                            bullet.change_y = math.sin(math.radians(bullet.angle)) * bullet.speed
-                            self.bullet_list.append(bullet)
-                            enemy.shoot_timer = ENEMY_SHOOT_DELAY
-
-                            # Reset the time since last fire
-                            enemy.time_since_last_fire = 0
-                    else:
-                        # Enemy cannot fire yet
-                        enemy.shoot_timer -= 1
-                        # Increment time since last fire
-                        enemy.time_since_last_fire += 1
-                # Increment time since last fire if enemy didn't shoot
-                if enemy.shoot_timer > 0:
-                    enemy.time_since_last_fire += 1
-            else:
-                # Enemy is too far from player, move randomly
-                if random.random() < 0.02:
-                    enemy.change_x = random.uniform(-ENEMY_MOVEMENT_SPEED, ENEMY_MOVEMENT_SPEED)
-                    enemy.change_y = random.uniform(-ENEMY_MOVEMENT_SPEED, ENEMY_MOVEMENT_SPEED)
-                if enemy.change_x != 0 or enemy.change_y != 0:
-                    enemy.angle = math.degrees(math.atan2(enemy.change_y, enemy.change_x))
-
-                enemy.time_since_last_fire += 1
-
-            # Apply movement
-            enemy.update()
-
-        # Play or stop the enemy near player sound
-        if self.audio_manager:
-            if enemy_near_player:
-                self.audio_manager.play_enemy_near_player_sound()
-            else:
-                self.audio_manager.stop_enemy_near_player_sound()
-
-    def handle_bosses(self):
-        for boss in self.boss_list:
-            # Keep boss within world circle
-            self.keep_sprite_within_world(boss)
-
-            # Handle collision with walls
-            boss.handle_collision(self.wall_list)
-
-            distance_to_player = arcade.get_distance_between_sprites(boss, self.player_sprite)
-
-            # Boss always follows the player
-            dx = self.player_sprite.center_x - boss.center_x
-            dy = self.player_sprite.center_y - boss.center_y
-            boss.angle = math.degrees(math.atan2(dy, dx))
-
-            if distance_to_player > BOSS_SHOOT_RANGE:
-                # Move towards player
-                boss.change_x = BOSS_MOVEMENT_SPEED * math.cos(math.radians(boss.angle))
-                boss.change_y = BOSS_MOVEMENT_SPEED * math.sin(math.radians(boss.angle))
-            else:
-                # Stop movement
-                boss.change_x = 0
-                boss.change_y = 0
-
-                # Shoot at player
-                if boss.shoot_timer <= 0:
-                    if self.is_within_cone(
-                        boss,
-                        self.player_sprite.center_x,
-                        self.player_sprite.center_y,
-                        boss.angle,
-                        BOSS_SHOOT_RANGE,
-                        CONE_ANGLE,
-                    ) and self.has_line_of_sight(boss, self.player_sprite, self.wall_list):
-                        bullet = Bullet(7, arcade.color.PURPLE, 'boss', BOSS_BULLET_SPEED)
-                        bullet.center_x = boss.center_x
-                        bullet.center_y = boss.center_y
-                        bullet.angle = boss.angle
-                        bullet.change_x = math.cos(math.radians(bullet.angle)) * bullet.speed
-                        bullet.change_y = math.sin(math.radians(bullet.angle)) * bullet.speed
-                        self.bullet_list.append(bullet)
-                        boss.shoot_timer = BOSS_SHOOT_DELAY
-
-                        # Reset the time since last fire
-                        boss.time_since_last_fire = 0
-                else:
-                    # Boss cannot fire yet
-                    boss.shoot_timer -= 1
-                    # Increment time since last fire
-                    boss.time_since_last_fire += 1
-
-            # Apply movement
-            boss.update()
-
-    def handle_pickups(self):
-        # Ammo pickups
-        ammo_hit_list = arcade.check_for_collision_with_list(
-            self.player_sprite, self.ammo_pickup_list
-        )
-        for ammo in ammo_hit_list:
-            self.player_sprite.ammo += AMMO_PICKUP_AMOUNT
-            ammo.remove_from_sprite_lists()
-
-        # Health pickups
-        health_hit_list = arcade.check_for_collision_with_list(
-            self.player_sprite, self.health_pickup_list
-        )
-        for health in health_hit_list:
-            self.player_sprite.health += HEALTH_PICKUP_AMOUNT
-            if self.player_sprite.health > PLAYER_HEALTH:
-                self.player_sprite.health = PLAYER_HEALTH  # Cap at max health
-            health.remove_from_sprite_lists()
-
-
 class GameOverView(arcade.View):
     def __init__(self, high_score, audio_manager):
         super().__init__()
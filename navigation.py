@@ -0,0 +1,210 @@
+# navigation.py
+
+import heapq
+import math
+
+import numpy as np
+
+from constants import (
+    NAV_CELL_SIZE, NAV_CLEARANCE, NAV_CLEARANCE_PENALTY, NAV_RANGE,
+    WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS,
+)
+
+_SQRT2 = math.sqrt(2)
+
+# Neighbor offsets (column, row) and step lengths in cells
+_STEPS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, _SQRT2), (1, -1, _SQRT2), (-1, 1, _SQRT2), (-1, -1, _SQRT2),
+)
+
+
+class FlowField:
+    """
+    Shared navigation toward one goal (the player) over a grid of the world square.
+    The walls are rasterized once per map: cells inside a wall or outside the world are
+    solid, cells within clearance of a wall are open but cost more to cross. Whenever the
+    goal moves to another cell, one integration field (path cost to the goal from every
+    cell within max_range of path) is rebuilt, and from it each cell's way to go: straight at
+    the goal if it is in clear view, otherwise toward the cheapest neighbor. Actors then look
+    up their direction in O(1), so the cost of pathfinding does not grow with the number of actors.
+    """
+
+    def __init__(self, wall_rects, cell_size=NAV_CELL_SIZE, clearance=NAV_CLEARANCE,
+                 clearance_penalty=NAV_CLEARANCE_PENALTY, max_range=NAV_RANGE):
+        self.cell_size = cell_size
+        self.max_cost = max_range / cell_size
+        self.origin_x = WORLD_CENTER_X - WORLD_RADIUS
+        self.origin_y = WORLD_CENTER_Y - WORLD_RADIUS
+        self.columns = math.ceil(2 * WORLD_RADIUS / cell_size)
+
+        # Cell centers, indexed [row, column]
+        centers = (np.arange(self.columns) + 0.5) * cell_size
+        self.center_x, self.center_y = np.meshgrid(self.origin_x + centers, self.origin_y + centers)
+        self.column_index, self.row_index = np.meshgrid(np.arange(self.columns), np.arange(self.columns))
+
+        self.solid = np.hypot(self.center_x - WORLD_CENTER_X, self.center_y - WORLD_CENTER_Y) > WORLD_RADIUS
+        near_wall = np.zeros_like(self.solid)
+        for left, bottom, right, top in np.asarray(wall_rects, dtype=float).reshape(-1, 4).tolist():
+            for grow, marked in ((0, self.solid), (clearance, near_wall)):
+                marked |= (
+                    (self.center_x >= left - grow) & (self.center_x <= right + grow)
+                    & (self.center_y >= bottom - grow) & (self.center_y <= top + grow)
+                )
+        # Cells a straight run toward the goal should not pass through
+        self.obstructed = self.solid | near_wall
+
+        # For every cell, the open cells that can step into it and what the step costs; a
+        # diagonal step may not cut the corner of a solid cell. Solid cells are only ever
+        # stepped into when the goal is in one.
+        rows = columns = self.columns
+        solid = self.solid.tolist()
+        weight = np.where(near_wall, clearance_penalty, 1.0).tolist()
+        self.arrivals = [[] for _ in range(rows * columns)]
+        for row in range(rows):
+            for column in range(columns):
+                for d_column, d_row, length in _STEPS:
+                    from_row, from_column = row - d_row, column - d_column
+                    if not (0 <= from_row < rows and 0 <= from_column < columns):
+                        continue
+                    if solid[from_row][from_column] or solid[from_row][column] or solid[row][from_column]:
+                        continue
+                    self.arrivals[row * columns + column].append(
+                        (from_row * columns + from_column, length * weight[row][column])
+                    )
+
+        self.goal_cell = None
+        self.goal_x = self.goal_y = 0.0
+        self.cost = np.full(self.solid.shape, np.inf)
+        self.direct = np.zeros(self.solid.shape, dtype=bool)
+        self.waypoint_x = np.full(self.solid.shape, np.nan)
+        self.waypoint_y = np.full(self.solid.shape, np.nan)
+        self.rebuilds = 0
+
+    def cell_of(self, x, y):
+        """
+        (column, row) of the cells containing the points, clamped to the grid.
+        """
+        column = np.floor((np.asarray(x, dtype=float) - self.origin_x) / self.cell_size).astype(np.intp)
+        row = np.floor((np.asarray(y, dtype=float) - self.origin_y) / self.cell_size).astype(np.intp)
+        return np.clip(column, 0, self.columns - 1), np.clip(row, 0, self.columns - 1)
+
+    def set_goal(self, x, y):
+        """
+        Point the field at (x, y); the field is rebuilt only if the goal changed cell.
+        """
+        self.goal_x, self.goal_y = x, y
+        column, row = self.cell_of(x, y)
+        cell = (int(column), int(row))
+        if cell != self.goal_cell:
+            self.goal_cell = cell
+            self._integrate()
+            self.rebuilds += 1
+
+    def _integrate(self):
+        column, row = self.goal_cell
+        goal = row * self.columns + column
+
+        # Dijkstra outwards from the goal along the reversed steps, remembering where each
+        # cell's cheapest path steps next; paths longer than max_cost are not followed
+        cost = [math.inf] * (self.columns * self.columns)
+        next_cell = [-1] * (self.columns * self.columns)
+        cost[goal] = 0.0
+        frontier = [(0.0, goal)]
+        arrivals = self.arrivals
+        pop, push = heapq.heappop, heapq.heappush
+        max_cost = self.max_cost
+        while frontier:
+            reached, cell = pop(frontier)
+            if reached > max_cost:
+                break
+            if reached > cost[cell]:
+                continue
+            for neighbor, step_cost in arrivals[cell]:
+                through = reached + step_cost
+                if through < cost[neighbor]:
+                    cost[neighbor] = through
+                    next_cell[neighbor] = cell
+                    push(frontier, (through, neighbor))
+        self.cost = cost = np.array(cost).reshape(self.solid.shape)
+        next_cell = np.array(next_cell).reshape(self.solid.shape)
+
+        # Cells off every path (solid ones, mostly) head for their cheapest neighbor to get back on
+        padded = np.pad(cost, 1, constant_values=np.inf)
+        best = np.full(cost.shape, np.inf)
+        next_column = np.full(cost.shape, -1)
+        next_row = np.full(cost.shape, -1)
+        for d_column, d_row, _ in _STEPS:
+            neighbor = padded[1 + d_row:1 + d_row + self.columns, 1 + d_column:1 + d_column + self.columns]
+            better = neighbor < best
+            best[better] = neighbor[better]
+            next_column[better] = self.column_index[better] + d_column
+            next_row[better] = self.row_index[better] + d_row
+        on_path = next_cell >= 0
+        next_column[on_path] = next_cell[on_path] % self.columns
+        next_row[on_path] = next_cell[on_path] // self.columns
+
+        # Actors steer for the center of the next cell, which also draws them off the walls they
+        # slide along; cells without a next cell have a NaN waypoint
+        routed = next_column >= 0
+        self.waypoint_x = np.full(cost.shape, np.nan)
+        self.waypoint_y = np.full(cost.shape, np.nan)
+        self.waypoint_x[routed] = self.center_x[next_row[routed], next_column[routed]]
+        self.waypoint_y[routed] = self.center_y[next_row[routed], next_column[routed]]
+
+        self.direct = self._in_clear_view(column, row, np.isfinite(cost))
+
+    def _in_clear_view(self, column, row, reached):
+        """
+        Reached cells from whose center the straight line to the goal cell's center crosses
+        no obstructed cell, sampled every half cell.
+        """
+        obstructed = self.obstructed.copy()
+        obstructed[row, column] = False  # The goal may stand closer to a wall than the clearance
+
+        dx = (self.center_x[row, column] - self.center_x).ravel()
+        dy = (self.center_y[row, column] - self.center_y).ravel()
+        samples = np.maximum(np.ceil(2 * np.hypot(dx, dy) / self.cell_size), 1)
+
+        # Both ends lie on the grid, so every sample does too
+        start_column = self.column_index.ravel() + 0.5
+        start_row = self.row_index.ravel() + 0.5
+        d_column = dx / self.cell_size
+        d_row = dy / self.cell_size
+
+        clear = ~obstructed.ravel() & reached.ravel()
+        candidates = np.flatnonzero(clear)
+        step = 1
+        while len(candidates):
+            fraction = np.minimum(step / samples[candidates], 1.0)
+            sample_column = (start_column[candidates] + fraction * d_column[candidates]).astype(np.intp)
+            sample_row = (start_row[candidates] + fraction * d_row[candidates]).astype(np.intp)
+            hit = obstructed[sample_row, sample_column]
+            clear[candidates[hit]] = False
+            # Lines that reached the goal cell are done
+            candidates = candidates[~hit & (step < samples[candidates])]
+            step += 1
+        return clear.reshape(obstructed.shape)
+
+    def direction_at(self, x, y):
+        """
+        Unit direction to move in from each point (x[i], y[i]), and whether the field has a
+        path to the goal from there. Where it has none, the direction is (0, 0).
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        column, row = self.cell_of(x, y)
+
+        # In clear view of the goal (or already in its cell) go straight at it, else for the next cell
+        straight = self.direct[row, column] | (self.cost[row, column] == 0)
+        target_x = np.where(straight, self.goal_x, self.waypoint_x[row, column])
+        target_y = np.where(straight, self.goal_y, self.waypoint_y[row, column])
+        to_target_x = target_x - x
+        to_target_y = target_y - y
+        length = np.hypot(to_target_x, to_target_y)
+
+        reachable = length > 0  # False for NaN waypoints too
+        length[~reachable] = 1.0
+        direction_x = np.where(reachable, to_target_x / length, 0.0)
+        direction_y = np.where(reachable, to_target_y / length, 0.0)
+        return direction_x, direction_y, reachable
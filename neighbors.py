@@ -0,0 +1,154 @@
+# neighbors.py
+
+import math
+
+import numpy as np
+
+from constants import NEIGHBOR_CELL_SIZE
+
+_NO_POINTS = np.empty(0, dtype=np.intp)
+
+# Keys pack (cell_x, cell_y) into one int64; cells are offset so both halves stay non-negative
+_KEY_OFFSET = 1 << 20
+_KEY_STRIDE = 1 << 21
+
+
+class NeighborIndex:
+    """
+    Uniform hash grid over a set of moving points (e.g. enemy and boss positions),
+    rebuilt from scratch each tick. Points are sorted by cell so each cell is one
+    contiguous run; radius, k-nearest and all-pairs queries only visit nearby cells.
+    """
+
+    def __init__(self, cell_size=NEIGHBOR_CELL_SIZE):
+        self.cell_size = cell_size
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+
+        # Point indices sorted by cell, and the key, first slot and size of each occupied cell
+        self.order = _NO_POINTS
+        self.cell_keys = np.empty(0, dtype=np.int64)
+        self.cell_starts = _NO_POINTS
+        self.cell_counts = _NO_POINTS
+
+        # Range of occupied cells: min_cx, min_cy, max_cx, max_cy
+        self.bounds = (0, 0, 0, 0)
+
+    def __len__(self):
+        return len(self.x)
+
+    def _cells(self, x, y):
+        cell_x = np.floor(np.asarray(x) / self.cell_size).astype(np.int64)
+        cell_y = np.floor(np.asarray(y) / self.cell_size).astype(np.int64)
+        return cell_x, cell_y
+
+    def _keys(self, cell_x, cell_y):
+        return (cell_x + _KEY_OFFSET) * _KEY_STRIDE + (cell_y + _KEY_OFFSET)
+
+    def rebuild(self, x, y):
+        """
+        Index the points (x[i], y[i]); query results are indices into these arrays.
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        keys = self._keys(*self._cells(self.x, self.y))
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+        if len(self.x):
+            min_cx, min_cy = self._cells(self.x.min(), self.y.min())
+            max_cx, max_cy = self._cells(self.x.max(), self.y.max())
+            self.bounds = (int(min_cx), int(min_cy), int(max_cx), int(max_cy))
+
+    def _cell_runs(self, keys):
+        """
+        First slot in self.order and point count of each key's cell (count 0 if empty).
+        """
+        if len(self.cell_keys) == 0:
+            empty = np.zeros(np.shape(keys), dtype=np.intp)
+            return empty, empty
+        slots = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        found = self.cell_keys[slots] == keys
+        return np.where(found, self.cell_starts[slots], 0), np.where(found, self.cell_counts[slots], 0)
+
+    def _points_in_cells(self, min_cx, min_cy, max_cx, max_cy):
+        keys = self._keys(
+            *np.meshgrid(np.arange(min_cx, max_cx + 1), np.arange(min_cy, max_cy + 1), indexing='ij')
+        ).ravel()
+        starts, counts = self._cell_runs(keys)
+        if counts.sum() == 0:
+            return _NO_POINTS
+        return self.order[np.concatenate([
+            np.arange(start, start + count) for start, count in zip(starts.tolist(), counts.tolist()) if count
+        ])]
+
+    def query_radius(self, x, y, radius):
+        """
+        Returns the indices of every point within radius of (x, y), nearest first.
+        """
+        if len(self.x) == 0:
+            return _NO_POINTS
+        min_cx, min_cy = self._cells(x - radius, y - radius)
+        max_cx, max_cy = self._cells(x + radius, y + radius)
+        candidates = self._points_in_cells(int(min_cx), int(min_cy), int(max_cx), int(max_cy))
+        distance = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+        inside = distance <= radius
+        candidates, distance = candidates[inside], distance[inside]
+        return candidates[np.argsort(distance, kind='stable')]
+
+    def query_nearest(self, x, y, k, max_radius=math.inf):
+        """
+        Returns the indices of the k points nearest to (x, y) within max_radius, nearest first.
+        Searches rings of cells outwards until k points are found that no farther cell can beat.
+        """
+        if len(self.x) == 0 or k <= 0:
+            return _NO_POINTS
+        cell_x, cell_y = (int(c) for c in self._cells(x, y))
+
+        # Rings beyond this cannot hold anything
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        max_ring = max(cell_x - min_cx, max_cx - cell_x, cell_y - min_cy, max_cy - cell_y, 0)
+
+        ring = 0
+        while True:
+            candidates = self._points_in_cells(cell_x - ring, cell_y - ring, cell_x + ring, cell_y + ring)
+            distance = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+            inside = distance <= max_radius
+            candidates, distance = candidates[inside], distance[inside]
+
+            # Everything within ring * cell_size of (x, y) lies inside the searched square
+            reach = ring * self.cell_size
+            if ring >= max_ring or reach >= max_radius or (distance <= reach).sum() >= k:
+                nearest = np.argsort(distance, kind='stable')[:k]
+                return candidates[nearest]
+            ring += 1
+
+    def pairs_within(self, radius):
+        """
+        Returns (i, j, distance) arrays for every pair of distinct points within radius
+        of each other, each pair once with i < j. radius must not exceed the cell size.
+        """
+        n = len(self.x)
+        if n < 2:
+            return _NO_POINTS, _NO_POINTS, np.empty(0)
+        cell_x, cell_y = self._cells(self.x, self.y)
+
+        first = []
+        second = []
+        for offset_x in (-1, 0, 1):
+            for offset_y in (-1, 0, 1):
+                starts, counts = self._cell_runs(self._keys(cell_x + offset_x, cell_y + offset_y))
+                # Expand each point's neighboring run into (point, candidate) rows
+                points = np.repeat(np.arange(n), counts)
+                run_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                candidates = self.order[np.repeat(starts, counts) + run_offsets]
+                keep = points < candidates
+                first.append(points[keep])
+                second.append(candidates[keep])
+
+        first = np.concatenate(first)
+        second = np.concatenate(second)
+        distance = np.hypot(self.x[first] - self.x[second], self.y[first] - self.y[second])
+        close = distance <= radius
+        return first[close], second[close], distance[close]
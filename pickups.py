@@ -0,0 +1,155 @@
+# pickups.py
+
+import arcade
+import numpy as np
+
+from ammo_pickup import AmmoPickup
+from constants import (
+    AMMO_PICKUP_AMOUNT,
+    AMMO_PICKUP_MERGE_RADIUS,
+    HEALTH_PICKUP_AMOUNT,
+    PICKUP_CAPS,
+    PICKUP_RADIUS,
+    PICKUP_TTL,
+)
+from pools import SpritePool
+
+# Sprite color and amount carried by a fresh pickup of each kind
+PICKUP_TYPES = {
+    'ammo': (arcade.color.BLUE, AMMO_PICKUP_AMOUNT),
+    'health': (arcade.color.GREEN, HEALTH_PICKUP_AMOUNT),
+}
+
+
+class _PickupStore:
+    """
+    Live pickups of one kind: position, expiry and amount in dense NumPy columns,
+    with the sprites in the same order. Removal swaps the last pickup into the hole.
+    """
+
+    def __init__(self, kind, cap):
+        color, _ = PICKUP_TYPES[kind]
+        # Pre-create the whole cap: once full, the oldest pickup is recycled for the new one
+        self.pool = SpritePool(lambda: AmmoPickup(PICKUP_RADIUS, color, 0, 0), cap)
+        self.sprite_list = arcade.SpriteList(lazy=True)
+        self.sprites = []
+        self.x = np.empty(cap)
+        self.y = np.empty(cap)
+        self.expires = np.empty(cap)
+        self.spawned = np.empty(cap)
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def add(self, x, y, amount, time, ttl):
+        sprite = self.pool.acquire()
+        sprite.center_x = x
+        sprite.center_y = y
+        sprite.amount = amount
+        index = len(self.sprites)
+        self.sprites.append(sprite)
+        self.sprite_list.append(sprite)
+        self.x[index] = x
+        self.y[index] = y
+        self.expires[index] = time + ttl
+        self.spawned[index] = time
+
+    def remove(self, index):
+        last = len(self.sprites) - 1
+        self.pool.release(self.sprites[index])
+        if index != last:
+            self.sprites[index] = self.sprites[last]
+            for column in (self.x, self.y, self.expires, self.spawned):
+                column[index] = column[last]
+        self.sprites.pop()
+
+    def remove_many(self, indices):
+        # Highest first, so swapping the last pickup in never moves one still to be removed
+        for index in sorted(indices, reverse=True):
+            self.remove(index)
+
+
+class PickupManager:
+    """
+    Owns every ammo and health pickup in the world.
+    Each kind has a cap (the oldest pickup makes room for a new one) and a time to live;
+    ammo dropped close to an existing ammo pickup is merged into it. Pickups are stored
+    compactly per kind and can be queried by region.
+    """
+
+    def __init__(self):
+        # Game time in seconds
+        self.time = 0.0
+        self.stores = {kind: _PickupStore(kind, PICKUP_CAPS[kind]) for kind in PICKUP_TYPES}
+
+    def sprite_list(self, kind):
+        return self.stores[kind].sprite_list
+
+    def pool(self, kind):
+        return self.stores[kind].pool
+
+    def __len__(self):
+        return sum(len(store) for store in self.stores.values())
+
+    def spawn(self, kind, x, y):
+        """
+        Drop a pickup of the given kind at (x, y).
+        """
+        store = self.stores[kind]
+        _, amount = PICKUP_TYPES[kind]
+        count = len(store)
+
+        if kind == 'ammo' and count:
+            # Merge into the nearest ammo pickup in reach instead of adding another sprite
+            distance = np.hypot(store.x[:count] - x, store.y[:count] - y)
+            nearest = int(np.argmin(distance))
+            if distance[nearest] <= AMMO_PICKUP_MERGE_RADIUS:
+                store.sprites[nearest].amount += amount
+                store.expires[nearest] = self.time + PICKUP_TTL[kind]
+                return
+
+        if count >= PICKUP_CAPS[kind]:
+            store.remove(int(np.argmin(store.spawned[:count])))
+        store.add(x, y, amount, self.time, PICKUP_TTL[kind])
+
+    def update(self, delta_time):
+        """
+        Advance the clock by delta_time seconds and despawn expired pickups.
+        """
+        self.time += delta_time
+        for store in self.stores.values():
+            expired = np.flatnonzero(store.expires[:len(store)] <= self.time)
+            store.remove_many(expired.tolist())
+
+    def in_rect(self, left, bottom, right, top, kinds=None):
+        """
+        Returns the pickups whose centers lie inside the rectangle.
+        """
+        found = []
+        for kind, store in self.stores.items():
+            if kinds is not None and kind not in kinds:
+                continue
+            count = len(store)
+            x, y = store.x[:count], store.y[:count]
+            inside = np.flatnonzero((left <= x) & (x <= right) & (bottom <= y) & (y <= top))
+            found.extend(store.sprites[index] for index in inside)
+        return found
+
+    def collect(self, sprite):
+        """
+        Remove every pickup the sprite touches and return them as (kind, amount) pairs.
+        """
+        collected = []
+        for kind, store in self.stores.items():
+            count = len(store)
+            # Only pickups near the sprite's box get the exact polygon test
+            x, y = store.x[:count], store.y[:count]
+            near = np.flatnonzero(
+                (sprite.left - PICKUP_RADIUS <= x) & (x <= sprite.right + PICKUP_RADIUS)
+                & (sprite.bottom - PICKUP_RADIUS <= y) & (y <= sprite.top + PICKUP_RADIUS)
+            )
+            touched = [index for index in near.tolist()
+                       if arcade.check_for_collision(sprite, store.sprites[index])]
+            collected.extend((kind, store.sprites[index].amount) for index in touched)
+            store.remove_many(touched)
+        return collected
@@ -26,7 +26,7 @@ class Player(arcade.Sprite):
         self.frame_count = 0  # Counter to control animation speed
 
     def update(self):
-        super().update()
+        # Position is updated by the CollisionResolver, not here
         # Update walking animation if moving
         if self.change_x != 0 or self.change_y != 0:
             self.frame_count += 1
@@ -0,0 +1,67 @@
+# pools.py
+
+
+class SpritePool:
+    """
+    Recycles sprites of one kind instead of constructing a new one per spawn.
+    Instances are pre-created up front; the pool only allocates when it runs dry.
+    """
+
+    def __init__(self, factory, size=0):
+        self.factory = factory
+        self.free = [factory() for _ in range(size)]
+
+        # Instances owned in all, free or in use
+        self.size = size
+
+        # New instances created after the initial fill
+        self.allocations = 0
+
+    def acquire(self):
+        """
+        Returns a free sprite, creating one if none is left.
+        """
+        if self.free:
+            return self.free.pop()
+        self.size += 1
+        self.allocations += 1
+        return self.factory()
+
+    def reserve(self, count, limit):
+        """
+        Pre-create sprites until the pool owns count, free or in use, creating at most limit now.
+        Sprites in use count because they come back with release. Returns how many were created.
+        """
+        build = max(min(count - self.size, limit), 0)
+        self.free.extend(self.factory() for _ in range(build))
+        self.size += build
+        self.allocations += build
+        return build
+
+    def release(self, sprite):
+        """
+        Takes the sprite out of its sprite lists and keeps it for the next acquire.
+        """
+        sprite.remove_from_sprite_lists()
+        self.free.append(sprite)
+
+
+class AllocationReport:
+    """
+    Allocations made by each pool during each wave.
+    sources maps a name to anything with an allocations counter (a SpritePool, the BulletSystem).
+    """
+
+    def __init__(self, sources):
+        self.sources = sources
+        self.waves = {}
+        self.baseline = {name: source.allocations for name, source in sources.items()}
+
+    def end_wave(self, wave_number):
+        """
+        Record what each source allocated since the previous wave ended.
+        """
+        counts = {name: source.allocations for name, source in self.sources.items()}
+        self.waves[wave_number] = {name: counts[name] - self.baseline[name] for name in counts}
+        self.baseline = counts
+        return self.waves[wave_number]
@@ -0,0 +1,200 @@
+# pvs.py
+
+import hashlib
+import json
+import math
+
+import numpy as np
+
+from constants import PVS_CELL_SIZE, PVS_VIEW_RANGE, WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS
+from raycast import segment_intersections
+
+# Bump when the on-disk layout or the build rules change so old caches are rebuilt
+PVS_FORMAT_VERSION = 1
+
+
+def map_content_hash(map_file):
+    """
+    Hash of the map file plus every setting the PVS depends on.
+    """
+    digest = hashlib.sha256()
+    with open(map_file, "rb") as f:
+        digest.update(f.read())
+    digest.update(json.dumps([
+        PVS_FORMAT_VERSION, PVS_CELL_SIZE, PVS_VIEW_RANGE,
+        WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS,
+    ]).encode())
+    return digest.hexdigest()
+
+
+def pvs_cache_path(map_file):
+    return map_file + ".pvs.npz"
+
+
+class PotentiallyVisibleSet:
+    """
+    For each cell of the world, the wall edges that can be seen from somewhere in the cell
+    within view_range. Segment queries starting in a cell only test that cell's list;
+    anything the PVS cannot answer (longer segments, points outside the world) goes to the
+    wall grid instead.
+    """
+
+    def __init__(self, wall_grid, map_hash, cell_starts, cell_edges,
+                 cell_size=PVS_CELL_SIZE, view_range=PVS_VIEW_RANGE):
+        self.wall_grid = wall_grid
+        self.edges = wall_grid.edges
+        self.map_hash = map_hash
+        self.cell_size = cell_size
+        self.view_range = view_range
+
+        # Cells cover the square around the world circle, row by row
+        self.origin_x = WORLD_CENTER_X - WORLD_RADIUS
+        self.origin_y = WORLD_CENTER_Y - WORLD_RADIUS
+        self.columns = math.ceil(2 * WORLD_RADIUS / cell_size)
+
+        # Compressed rows: cell i owns cell_edges[cell_starts[i]:cell_starts[i + 1]]
+        self.cell_starts = cell_starts
+        self.cell_edges = cell_edges
+
+    @classmethod
+    def build(cls, wall_grid, map_hash, cell_size=PVS_CELL_SIZE, view_range=PVS_VIEW_RANGE):
+        edges = wall_grid.edges
+        columns = math.ceil(2 * WORLD_RADIUS / cell_size)
+        origin_x = WORLD_CENTER_X - WORLD_RADIUS
+        origin_y = WORLD_CENTER_Y - WORLD_RADIUS
+
+        x1, y1, x2, y2 = edges.T
+        min_x, max_x = np.minimum(x1, x2), np.maximum(x1, x2)
+        min_y, max_y = np.minimum(y1, y2), np.maximum(y1, y2)
+
+        cell_starts = [0]
+        cell_edges = []
+        for row in range(columns):
+            bottom = origin_y + row * cell_size
+            top = bottom + cell_size
+            for column in range(columns):
+                left = origin_x + column * cell_size
+                right = left + cell_size
+
+                # Edges within view range of some point of the cell
+                gap_x = np.maximum(0, np.maximum(min_x - right, left - max_x))
+                gap_y = np.maximum(0, np.maximum(min_y - top, bottom - max_y))
+                visible = np.flatnonzero(np.hypot(gap_x, gap_y) <= view_range)
+                cell_edges.append(visible)
+                cell_starts.append(cell_starts[-1] + len(visible))
+
+        return cls(
+            wall_grid, map_hash,
+            np.array(cell_starts, dtype=np.intp),
+            np.concatenate(cell_edges).astype(np.intp) if cell_edges else np.empty(0, dtype=np.intp),
+            cell_size, view_range,
+        )
+
+    @classmethod
+    def load_or_build(cls, map_file, wall_grid):
+        """
+        Load the PVS cached next to map_file, rebuilding and saving it if the map has changed.
+        """
+        map_hash = map_content_hash(map_file)
+        path = pvs_cache_path(map_file)
+        try:
+            with np.load(path) as cached:
+                if str(cached["map_hash"]) == map_hash:
+                    return cls(wall_grid, map_hash, cached["cell_starts"], cached["cell_edges"])
+        except (OSError, KeyError, ValueError):
+            pass
+
+        pvs = cls.build(wall_grid, map_hash)
+        try:
+            with open(path, "wb") as f:
+                np.savez(
+                    f, map_hash=map_hash,
+                    cell_starts=pvs.cell_starts, cell_edges=pvs.cell_edges,
+                )
+        except OSError:
+            pass  # Read-only install: the PVS is simply rebuilt next time
+        return pvs
+
+    def cell_candidates(self, x, y):
+        """
+        Returns the PVS of the cell containing (x, y), or None if the point is outside the grid.
+        """
+        column = math.floor((x - self.origin_x) / self.cell_size)
+        row = math.floor((y - self.origin_y) / self.cell_size)
+        if not (0 <= column < self.columns and 0 <= row < self.columns):
+            return None
+        cell = row * self.columns + column
+        return self.cell_edges[self.cell_starts[cell]:self.cell_starts[cell + 1]]
+
+    def candidates_near(self, x, y, radius):
+        """
+        Returns the edges that segments of up to radius starting at (x, y) could hit.
+        """
+        if radius <= self.view_range:
+            candidates = self.cell_candidates(x, y)
+            if candidates is not None:
+                return candidates
+        return self.wall_grid.candidates_near(x, y, radius)
+
+    def cell_key(self, x, y, radius):
+        """
+        Broad-phase cell of a point; points with the same key share candidates_in_cell.
+        """
+        if radius <= self.view_range:
+            column = math.floor((x - self.origin_x) / self.cell_size)
+            row = math.floor((y - self.origin_y) / self.cell_size)
+            if 0 <= column < self.columns and 0 <= row < self.columns:
+                return row, column
+        return "grid", self.wall_grid.cell_key(x, y, radius)
+
+    def candidates_in_cell(self, x, y, radius):
+        """
+        Returns the edges that segments of up to radius starting anywhere in the cell of (x, y) could hit.
+        """
+        if radius <= self.view_range:
+            candidates = self.cell_candidates(x, y)
+            if candidates is not None:
+                return candidates
+        return self.wall_grid.candidates_in_cell(x, y, radius)
+
+    def _segment_candidates(self, x1, y1, x2, y2):
+        if math.hypot(x2 - x1, y2 - y1) <= self.view_range:
+            return self.cell_candidates(x1, y1)
+        return None
+
+    def first_hit(self, x1, y1, x2, y2):
+        """
+        Finds the wall edge hit closest to (x1, y1) along the segment.
+        Returns (intersect_x, intersect_y, edge_index) or None if the segment is clear.
+        """
+        candidates = self._segment_candidates(x1, y1, x2, y2)
+        if candidates is None:
+            return self.wall_grid.first_hit(x1, y1, x2, y2)
+        if len(candidates) == 0:
+            return None
+
+        hit, intersect_x, intersect_y = segment_intersections(
+            float(x1), float(y1), float(x2), float(y2), self.edges[candidates]
+        )
+        hit, intersect_x, intersect_y = hit[0], intersect_x[0], intersect_y[0]
+        if not hit.any():
+            return None
+
+        distance = np.where(hit, np.hypot(intersect_x - x1, intersect_y - y1), np.inf)
+        closest = int(np.argmin(distance))
+        return float(intersect_x[closest]), float(intersect_y[closest]), int(candidates[closest])
+
+    def segment_blocked(self, x1, y1, x2, y2):
+        """
+        Returns True if the segment crosses any wall edge.
+        """
+        candidates = self._segment_candidates(x1, y1, x2, y2)
+        if candidates is None:
+            return self.wall_grid.segment_blocked(x1, y1, x2, y2)
+        if len(candidates) == 0:
+            return False
+
+        hit, _, _ = segment_intersections(
+            float(x1), float(y1), float(x2), float(y2), self.edges[candidates]
+        )
+        return bool(hit.any())
@@ -0,0 +1,117 @@
+# quality_governor.py
+
+import math
+from collections import deque
+
+from constants import (
+    FRAME_BUDGET,
+    QUALITY_SMOOTHING,
+    QUALITY_DOWNGRADE_FRAMES,
+    QUALITY_UPGRADE_FRAMES,
+    QUALITY_UPGRADE_HEADROOM,
+    QUALITY_DECISION_HISTORY,
+)
+
+
+class QualityLevel:
+    """
+    One set of rendering knobs:
+    step_angle: degrees between rays of a sampled ("rays" mode) cone
+    arc_step: degrees between samples along the outer arc of a swept cone
+    enemy_cone_range: enemies and bosses farther than this from the player get no light cone
+    visibility_interval: frames between recomputations of the visible set
+    max_arrows: most off-screen enemy arrows drawn (math.inf for all)
+    """
+
+    def __init__(self, name, step_angle, arc_step, enemy_cone_range, visibility_interval, max_arrows):
+        self.name = name
+        self.step_angle = step_angle
+        self.arc_step = arc_step
+        self.enemy_cone_range = enemy_cone_range
+        self.visibility_interval = visibility_interval
+        self.max_arrows = max_arrows
+
+
+# From best looking to cheapest
+QUALITY_LEVELS = (
+    QualityLevel("high", 1, 2, math.inf, 1, math.inf),
+    QualityLevel("medium", 2, 4, 600, 2, math.inf),
+    QualityLevel("low", 3, 6, 400, 3, 4),
+    QualityLevel("minimal", 5, 10, 0, 4, 0),
+)
+
+
+class QualityGovernor:
+    """
+    Watches the measured frame time against a budget and steps the quality level down when
+    frames run long, and back up once there is clear headroom again.
+    Each change is recorded in decisions so it can be logged.
+    """
+
+    def __init__(self, frame_budget=FRAME_BUDGET, levels=QUALITY_LEVELS):
+        self.frame_budget = frame_budget
+        self.levels = levels
+        self.level_index = 0
+
+        # Smoothed frame time, so a single slow frame does not change the level
+        self.average_frame_time = None
+        self.frames_over = 0
+        self.frames_under = 0
+        self.frame = 0
+
+        self.decisions = deque(maxlen=QUALITY_DECISION_HISTORY)
+
+    @property
+    def level(self):
+        return self.levels[self.level_index]
+
+    def record_frame(self, frame_time):
+        """
+        Feed the seconds spent in on_update + on_draw for one frame.
+        Returns True if the quality level changed.
+        """
+        self.frame += 1
+        if self.average_frame_time is None:
+            self.average_frame_time = frame_time
+        else:
+            self.average_frame_time += QUALITY_SMOOTHING * (frame_time - self.average_frame_time)
+
+        if self.average_frame_time > self.frame_budget:
+            self.frames_over += 1
+            self.frames_under = 0
+            if self.frames_over >= QUALITY_DOWNGRADE_FRAMES and self.level_index < len(self.levels) - 1:
+                self._change(self.level_index + 1, "over budget")
+                return True
+        elif self.average_frame_time < self.frame_budget * QUALITY_UPGRADE_HEADROOM:
+            self.frames_under += 1
+            self.frames_over = 0
+            if self.frames_under >= QUALITY_UPGRADE_FRAMES and self.level_index > 0:
+                self._change(self.level_index - 1, "headroom")
+                return True
+        else:
+            self.frames_over = 0
+            self.frames_under = 0
+        return False
+
+    def _change(self, level_index, reason):
+        self.decisions.append({
+            "frame": self.frame,
+            "from": self.level.name,
+            "to": self.levels[level_index].name,
+            "average_frame_time": self.average_frame_time,
+            "reason": reason,
+        })
+        self.level_index = level_index
+        self.frames_over = 0
+        self.frames_under = 0
+
+    def stats(self):
+        """
+        Returns the current level and frame-time figures, e.g. for logging.
+        """
+        return {
+            "level": self.level.name,
+            "average_frame_time": self.average_frame_time,
+            "frame_budget": self.frame_budget,
+            "changes": len(self.decisions),
+        }
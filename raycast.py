@@ -0,0 +1,90 @@
+# raycast.py
+
+import math
+
+import numpy as np
+
+
+def segment_intersections(x1, y1, x2, y2, edges):
+    """
+    Intersect segments (x1, y1)-(x2, y2) with every edge of an (N, 4) edge array.
+    Each pair is solved as the intersection of the two lines (Cramer's rule on the line
+    determinants), kept only if it falls inside both segments' bounding boxes.
+    Returns (hit, intersect_x, intersect_y); segment arguments may be scalars or column arrays.
+    """
+    x3, y3, x4, y4 = (edges[:, i][None, :] for i in range(4))
+
+    denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    parallel = denom == 0
+    denom = np.where(parallel, 1.0, denom)
+
+    cross_segment = x1 * y2 - y1 * x2
+    cross_edge = x3 * y4 - y3 * x4
+    intersect_x = (cross_segment * (x3 - x4) - (x1 - x2) * cross_edge) / denom
+    intersect_y = (cross_segment * (y3 - y4) - (y1 - y2) * cross_edge) / denom
+
+    # Keep only intersections inside both segments
+    hit = (
+        ~parallel
+        & (np.minimum(x1, x2) <= intersect_x) & (intersect_x <= np.maximum(x1, x2))
+        & (np.minimum(y1, y2) <= intersect_y) & (intersect_y <= np.maximum(y1, y2))
+        & (np.minimum(x3, x4) <= intersect_x) & (intersect_x <= np.maximum(x3, x4))
+        & (np.minimum(y3, y4) <= intersect_y) & (intersect_y <= np.maximum(y3, y4))
+    )
+    return hit, intersect_x, intersect_y
+
+
+def segment_blocked(start_x, start_y, end_x, end_y, edges):
+    """
+    Returns True if the segment from (start_x, start_y) to (end_x, end_y) crosses any edge.
+    """
+    if len(edges) == 0:
+        return False
+    hit, _, _ = segment_intersections(
+        float(start_x), float(start_y), float(end_x), float(end_y), edges
+    )
+    return bool(hit.any())
+
+
+def cast_rays(start_x, start_y, angles, max_length, edges):
+    """
+    Cast one ray per angle (in degrees) from (start_x, start_y) against every edge at once.
+    Batched version of TopDownShooter.cast_ray: returns an (R, 2) array of ray endpoints.
+    start_x, start_y and max_length may also be per-ray arrays to cast many cones together.
+    """
+    # Ray directions use math.cos/sin so the endpoints match cast_ray bit for bit
+    radians = [math.radians(angle) for angle in angles]
+    cos_a = np.array([math.cos(r) for r in radians], dtype=float)
+    sin_a = np.array([math.sin(r) for r in radians], dtype=float)
+
+    x1 = np.broadcast_to(np.asarray(start_x, dtype=float), cos_a.shape)
+    y1 = np.broadcast_to(np.asarray(start_y, dtype=float), cos_a.shape)
+    max_length = np.broadcast_to(np.asarray(max_length, dtype=float), cos_a.shape)
+    end_points = np.column_stack((x1 + cos_a * max_length, y1 + sin_a * max_length))
+    if len(edges) == 0 or len(radians) == 0:
+        return end_points
+
+    hit, intersect_x, intersect_y = segment_intersections(
+        x1[:, None], y1[:, None], end_points[:, 0:1], end_points[:, 1:2], edges
+    )
+
+    distance = np.where(hit, np.hypot(intersect_x - x1[:, None], intersect_y - y1[:, None]), np.inf)
+    closest = np.argmin(distance, axis=1)
+
+    # Rays that hit something, measured with math.hypot like cast_ray
+    rays = np.flatnonzero(hit.any(axis=1))
+    edge = closest[rays]
+    closest_distance = np.array(list(map(
+        math.hypot,
+        (intersect_x[rays, edge] - x1[rays]).tolist(),
+        (intersect_y[rays, edge] - y1[rays]).tolist(),
+    )), dtype=float)
+
+    # Ensure the ray stops exactly at the wall boundary
+    stopped = closest_distance < max_length[rays]
+    rays = rays[stopped]
+    closest_distance = closest_distance[stopped]
+    end_points[rays, 0] = x1[rays] + cos_a[rays] * closest_distance
+    end_points[rays, 1] = y1[rays] + sin_a[rays] * closest_distance
+
+    return end_points
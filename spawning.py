@@ -0,0 +1,134 @@
+# spawning.py
+
+import math
+
+import numpy as np
+
+from constants import (
+    SAFE_SPAWN_DISTANCE, SPAWN_CELL_SIZE, SPAWN_MAX_ROUNDS, SPAWN_OVERSAMPLE, SPAWN_SPACING,
+    SPAWN_WALL_CLEARANCE, WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS,
+)
+from neighbors import NeighborIndex
+
+
+class SpawnPlanner:
+    """
+    Chooses where enemies and pickups appear. The walls, grown by clearance, are rasterized
+    once per map into a fine grid of blocked cells, so testing any number of points against
+    them is one array lookup. A whole wave is placed in one batch: candidates are drawn
+    uniformly over the world disc, points too close to the player or inside a grown wall
+    are dropped, and the rest are thinned so no two spawns are closer than the spacing
+    (Poisson-disk). A bounded number of rounds keeps the cost predictable.
+    """
+
+    def __init__(self, wall_rects, clearance=SPAWN_WALL_CLEARANCE, cell_size=SPAWN_CELL_SIZE):
+        self.cell_size = cell_size
+        self.origin_x = WORLD_CENTER_X - WORLD_RADIUS
+        self.origin_y = WORLD_CENTER_Y - WORLD_RADIUS
+        self.columns = math.ceil(2 * WORLD_RADIUS / cell_size)
+
+        # Every cell touching a grown wall is blocked, indexed [row, column]
+        self.blocked = np.zeros((self.columns, self.columns), dtype=bool)
+        for left, bottom, right, top in np.asarray(wall_rects, dtype=float).reshape(-1, 4).tolist():
+            min_column, min_row = self._cell_of(left - clearance, bottom - clearance)
+            max_column, max_row = self._cell_of(right + clearance, top + clearance)
+            self.blocked[min_row:max_row + 1, min_column:max_column + 1] = True
+
+    def _cell_of(self, x, y):
+        column = np.floor((np.asarray(x, dtype=float) - self.origin_x) / self.cell_size).astype(np.intp)
+        row = np.floor((np.asarray(y, dtype=float) - self.origin_y) / self.cell_size).astype(np.intp)
+        return np.clip(column, 0, self.columns - 1), np.clip(row, 0, self.columns - 1)
+
+    def is_clear(self, x, y):
+        """
+        Boolean array: which points (x[i], y[i]) are clear of every grown wall.
+        """
+        column, row = self._cell_of(x, y)
+        return ~self.blocked[row, column]
+
+    def _candidates(self, rng, count, avoid_x, avoid_y, safe_distance):
+        """
+        Up to count points drawn over the world disc that are far enough from (avoid_x, avoid_y)
+        and clear of the walls.
+        """
+        angle = rng.uniform(0, 2 * math.pi, count)
+        r = WORLD_RADIUS * np.sqrt(rng.uniform(0, 1, count))
+        x = WORLD_CENTER_X + r * np.cos(angle)
+        y = WORLD_CENTER_Y + r * np.sin(angle)
+        keep = (np.hypot(x - avoid_x, y - avoid_y) >= safe_distance) & self.is_clear(x, y)
+        return x[keep], y[keep]
+
+    def place(self, rng, count, avoid_x, avoid_y, safe_distance=SAFE_SPAWN_DISTANCE, spacing=SPAWN_SPACING):
+        """
+        Returns (x, y) arrays of count spawn points at least safe_distance from
+        (avoid_x, avoid_y), clear of the walls and, where room allows, at least spacing apart.
+        If the rounds run out, the remaining points only keep the distance and wall rules, and
+        on a map with no room left for those, fewer than count points are returned.
+        """
+        x = np.empty(0)
+        y = np.empty(0)
+        index = NeighborIndex(cell_size=max(spacing, 1))
+        spares_x = []
+        spares_y = []
+        for _ in range(SPAWN_MAX_ROUNDS):
+            missing = count - len(x)
+            if missing <= 0:
+                break
+            new_x, new_y = self._candidates(rng, missing * SPAWN_OVERSAMPLE, avoid_x, avoid_y, safe_distance)
+
+            # Two points in one cell of side spacing / sqrt(2) are always too close: keep the first
+            cell = spacing / math.sqrt(2)
+            if cell > 0 and len(new_x):
+                _, first = np.unique(
+                    np.floor(new_x / cell) * 1e6 + np.floor(new_y / cell), return_index=True
+                )
+                unique = np.zeros(len(new_x), dtype=bool)
+                unique[first] = True
+                spares_x.append(new_x[~unique])
+                spares_y.append(new_y[~unique])
+                new_x, new_y = new_x[unique], new_y[unique]
+
+            keep = self._thin(x, y, new_x, new_y, index, spacing)
+            spares_x.append(new_x[~keep])
+            spares_y.append(new_y[~keep])
+            x = np.concatenate((x, new_x[keep][:missing]))
+            y = np.concatenate((y, new_y[keep][:missing]))
+
+        # Out of rounds: top up from the candidates that only broke the spacing, then with fresh
+        # candidates that ignore it; the distance and wall rules are never dropped
+        if len(x) < count:
+            x = np.concatenate([x] + spares_x)[:count]
+            y = np.concatenate([y] + spares_y)[:count]
+        for _ in range(SPAWN_MAX_ROUNDS):
+            missing = count - len(x)
+            if missing <= 0:
+                break
+            new_x, new_y = self._candidates(rng, missing * SPAWN_OVERSAMPLE, avoid_x, avoid_y, safe_distance)
+            x = np.concatenate((x, new_x[:missing]))
+            y = np.concatenate((y, new_y[:missing]))
+        return x, y
+
+    @staticmethod
+    def _thin(x, y, new_x, new_y, index, spacing):
+        """
+        Which of the candidates (new_x, new_y) to accept, taking them in order and rejecting any
+        within spacing of an accepted point or an earlier accepted candidate.
+        """
+        count = len(x)
+        index.rebuild(np.concatenate((x, new_x)), np.concatenate((y, new_y)))
+        earlier, later, _ = index.pairs_within(spacing)
+
+        # Resolve the greedy order in parallel: a point is rejected once an earlier neighbor is
+        # accepted, and accepted once every earlier neighbor is rejected
+        state = np.zeros(len(index), dtype=np.int8)  # 1 accepted, -1 rejected, 0 not yet known
+        state[:count] = 1
+        while True:
+            undecided = state == 0
+            blocked = np.bincount(later[state[earlier] == 1], minlength=len(state)) > 0
+            state[undecided & blocked] = -1
+            waiting = np.bincount(later[state[earlier] == 0], minlength=len(state)) > 0
+            accept = (state == 0) & ~waiting
+            if not accept.any():
+                break
+            state[accept] = 1
+        return state[count:] == 1
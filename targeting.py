@@ -0,0 +1,74 @@
+# targeting.py
+
+import numpy as np
+
+from constants import CONE_ANGLE, CONE_LENGTH, TARGET_DISTANCE_BAND
+
+
+class TargetSelector:
+    """
+    Picks what the player's auto-fire shoots at. Candidates come from a radius query on the
+    actor NeighborIndex, are filtered to the firing cone and ranked: bosses first, then
+    nearest (in TARGET_DISTANCE_BAND steps), then lowest health. Line of sight is tested
+    only in that order and only until one passes. The chosen target is kept, at the cost
+    of one line-of-sight test, until it dies or leaves the cone.
+    """
+
+    def __init__(self, cone_length=CONE_LENGTH, cone_angle=CONE_ANGLE, distance_band=TARGET_DISTANCE_BAND):
+        self.cone_length = cone_length
+        self.cone_angle = cone_angle
+        self.distance_band = distance_band
+        self.target = None
+
+        # Line-of-sight tests run, for profiling
+        self.line_of_sight_checks = 0
+
+    def in_cone(self, shooter, x, y):
+        """
+        Boolean array: which points (x[i], y[i]) lie inside the shooter's firing cone.
+        """
+        dx = np.asarray(x, dtype=float) - shooter.center_x
+        dy = np.asarray(y, dtype=float) - shooter.center_y
+        angle_to_target = np.degrees(np.arctan2(dy, dx))
+        angle_difference = np.abs((angle_to_target - shooter.angle + 180) % 360 - 180)
+        return (np.hypot(dx, dy) < self.cone_length) & (angle_difference < self.cone_angle / 2)
+
+    def _visible(self, shooter, target, has_line_of_sight):
+        self.line_of_sight_checks += 1
+        return has_line_of_sight(shooter, target)
+
+    def select(self, shooter, index, sprites, is_boss, has_line_of_sight):
+        """
+        Returns the sprite to shoot at, or None. index is a NeighborIndex whose points are the
+        positions of sprites (and must hold every actor within cone range of the shooter),
+        is_boss flags the bosses among them and has_line_of_sight(shooter, target) is the wall test.
+        """
+        # Stick with the current target while it is alive, in the cone and in view
+        target = self.target
+        if (
+            target is not None and target.sprite_lists
+            and self.in_cone(shooter, [target.center_x], [target.center_y])[0]
+            and self._visible(shooter, target, has_line_of_sight)
+        ):
+            return target
+        self.target = None
+
+        nearby = index.query_radius(shooter.center_x, shooter.center_y, self.cone_length)
+        nearby = nearby[self.in_cone(shooter, index.x[nearby], index.y[nearby])]
+        if len(nearby) == 0:
+            return None
+
+        # Rank by boss first, then distance band, then health; the last key sorts first in lexsort
+        candidates = [sprites[i] for i in nearby.tolist()]
+        distance = np.hypot(index.x[nearby] - shooter.center_x, index.y[nearby] - shooter.center_y)
+        order = np.lexsort((
+            [candidate.health for candidate in candidates],
+            np.floor(distance / self.distance_band),
+            ~np.asarray(is_boss, dtype=bool)[nearby],
+        ))
+        for rank in order.tolist():
+            candidate = candidates[rank]
+            if candidate is not target and candidate.sprite_lists and self._visible(shooter, candidate, has_line_of_sight):
+                self.target = candidate
+                return candidate
+        return None
@@ -0,0 +1,219 @@
+# visibility.py
+
+import math
+
+import numpy as np
+
+from constants import VISIBILITY_ARC_STEP
+from raycast import cast_rays
+
+# Rays are cast this many degrees either side of each wall corner to see past it
+CORNER_EPSILON = 1e-3
+
+
+class VisibilityPolygon:
+    """
+    Exact lit area of a cone: the origin plus boundary points sorted by angle.
+    """
+
+    def __init__(self, start_x, start_y, start_angle, cone_length, cone_angle, angles, points):
+        self.start_x = start_x
+        self.start_y = start_y
+        self.start_angle = start_angle  # Angle of the first boundary point, in degrees
+        self.cone_length = cone_length
+        self.cone_angle = cone_angle
+        self.angles = angles  # Sorted offsets from start_angle, in degrees
+        self.points = points  # (P, 2) boundary points matching angles
+
+        # Rays that reached the full cone length without hitting a wall
+        distance = np.hypot(points[:, 0] - start_x, points[:, 1] - start_y)
+        self.open_rays = distance >= cone_length - 1e-6
+
+    def contains(self, x, y):
+        """
+        Check if a point lies inside the lit polygon.
+        """
+        dx = x - self.start_x
+        dy = y - self.start_y
+        if math.hypot(dx, dy) >= self.cone_length:
+            return False
+
+        offset = (math.degrees(math.atan2(dy, dx)) - self.start_angle) % 360
+        if offset > self.angles[-1]:
+            return False
+
+        # Find the boundary segment bracketing the point's angle
+        index = int(np.searchsorted(self.angles, offset))
+        index = min(max(index, 1), len(self.angles) - 1)
+        ax, ay = self.points[index - 1]
+        bx, by = self.points[index]
+
+        # Between two unblocked rays the boundary is the cone's arc, which the range check covered
+        if self.open_rays[index - 1] and self.open_rays[index]:
+            return True
+
+        # The point is lit if it is on the origin's side of that segment
+        point_side = (bx - ax) * (y - ay) - (by - ay) * (x - ax)
+        origin_side = (bx - ax) * (self.start_y - ay) - (by - ay) * (self.start_x - ax)
+        return point_side * origin_side >= 0
+
+
+def _fan_offsets(cone_angle, step_angle):
+    """
+    Ray offsets at most step_angle degrees apart from 0 to exactly cone_angle, so a slice of
+    any width covers both of its edges and nothing past them.
+    """
+    return np.linspace(0, cone_angle, math.ceil(cone_angle / step_angle - 1e-9) + 1)
+
+
+def cast_ray_fan(start_x, start_y, start_angle, cone_length, cone_angle, wall_grid, step_angle=1):
+    """
+    Sample the cone with one ray every step_angle degrees and return the resulting polygon.
+    wall_grid is any wall index with candidates_near (WallGrid or PotentiallyVisibleSet).
+    """
+    offsets = _fan_offsets(cone_angle, step_angle)
+
+    # Only the edges near the cone can stop its rays
+    nearby = wall_grid.candidates_near(start_x, start_y, cone_length)
+    points = cast_rays(
+        start_x, start_y, (start_angle + offsets).tolist(), cone_length, wall_grid.edges[nearby]
+    )
+    return VisibilityPolygon(
+        start_x, start_y, start_angle, cone_length, cone_angle, offsets, points
+    )
+
+
+def _edge_circle_angles(start_x, start_y, radius, edges):
+    """
+    Angles (in degrees) at which the edges cross the circle of the given radius around the start.
+    """
+    px = edges[:, 0] - start_x
+    py = edges[:, 1] - start_y
+    dx = edges[:, 2] - edges[:, 0]
+    dy = edges[:, 3] - edges[:, 1]
+
+    a = dx * dx + dy * dy
+    b = 2 * (px * dx + py * dy)
+    c = px * px + py * py - radius * radius
+    discriminant = b * b - 4 * a * c
+    valid = (a > 0) & (discriminant >= 0)
+    root = np.sqrt(np.where(valid, discriminant, 0))
+    a = np.where(valid, a, 1)
+
+    angles = []
+    for t in ((-b - root) / (2 * a), (-b + root) / (2 * a)):
+        on_edge = valid & (t >= 0) & (t <= 1)
+        angles.append(np.degrees(np.arctan2(py[on_edge] + t[on_edge] * dy[on_edge],
+                                            px[on_edge] + t[on_edge] * dx[on_edge])))
+    return np.concatenate(angles)
+
+
+def _in_range(start_x, start_y, cone_length, edges):
+    """
+    Mask of the edges that actually reach into the circle of the cone's range.
+    """
+    px = edges[:, 0] - start_x
+    py = edges[:, 1] - start_y
+    dx = edges[:, 2] - edges[:, 0]
+    dy = edges[:, 3] - edges[:, 1]
+    t = np.clip(-(px * dx + py * dy) / np.maximum(dx * dx + dy * dy, 1e-12), 0, 1)
+    return np.hypot(px + t * dx, py + t * dy) < cone_length
+
+
+def _sweep_offsets(start_x, start_y, start_angle, cone_length, cone_angle, edges,
+                   arc_step=VISIBILITY_ARC_STEP):
+    """
+    Critical ray angles of a cone, as sorted offsets from start_angle: the cone boundaries,
+    each corner in range (and just either side of it), where edges leave the cone's range,
+    and every arc_step degrees along the outer arc.
+    """
+    corners = np.vstack((edges[:, 0:2], edges[:, 2:4]))
+    corner_distance = np.hypot(corners[:, 0] - start_x, corners[:, 1] - start_y)
+    corners = corners[corner_distance < cone_length]
+    corner_angles = np.degrees(np.arctan2(corners[:, 1] - start_y, corners[:, 0] - start_x))
+
+    offsets = np.concatenate((
+        corner_angles - CORNER_EPSILON,
+        corner_angles,
+        corner_angles + CORNER_EPSILON,
+        _edge_circle_angles(start_x, start_y, cone_length, edges),
+    ))
+    offsets = (offsets - start_angle) % 360
+    offsets = offsets[offsets <= cone_angle]
+    return np.unique(np.concatenate((
+        offsets,
+        np.arange(0, cone_angle, arc_step, dtype=float),
+        [float(cone_angle)],
+    )))
+
+
+def compute_visibility_polygon(start_x, start_y, facing_angle, cone_length, cone_angle, wall_grid,
+                               arc_step=VISIBILITY_ARC_STEP):
+    """
+    Sweep the cone once over the corners of the nearby wall edges and return its exact lit polygon.
+    Rays are only cast at the critical angles from _sweep_offsets, so the cost follows the
+    number of nearby edges rather than an angular step.
+    """
+    start_angle = facing_angle - cone_angle / 2
+
+    nearby = wall_grid.candidates_near(start_x, start_y, cone_length)
+    edges = wall_grid.edges[nearby]
+    edges = edges[_in_range(start_x, start_y, cone_length, edges)]
+    offsets = _sweep_offsets(start_x, start_y, start_angle, cone_length, cone_angle, edges, arc_step)
+
+    points = cast_rays(start_x, start_y, (start_angle + offsets).tolist(), cone_length, edges)
+    return VisibilityPolygon(
+        start_x, start_y, start_angle, cone_length, cone_angle, offsets, points
+    )
+
+
+def compute_cone_polygons(cones, wall_grid, mode="sweep", step_angle=1, arc_step=VISIBILITY_ARC_STEP):
+    """
+    Solve many cones together. cones is a list of (start_x, start_y, facing_angle, cone_length,
+    cone_angle); returns one VisibilityPolygon per cone, in order.
+    Cones starting in the same broad-phase cell share one candidate-edge lookup, and all of
+    their rays are cast against those edges in a single batch.
+    """
+    groups = {}
+    for index, (start_x, start_y, _, cone_length, _) in enumerate(cones):
+        key = (wall_grid.cell_key(start_x, start_y, cone_length), cone_length)
+        groups.setdefault(key, []).append(index)
+
+    polygons = [None] * len(cones)
+    for (_, cone_length), members in groups.items():
+        first_x, first_y = cones[members[0]][0], cones[members[0]][1]
+        shared = wall_grid.edges[wall_grid.candidates_in_cell(first_x, first_y, cone_length)]
+
+        # Every ray of every cone in the group, with its own origin
+        ray_offsets = []
+        reachable = np.zeros(len(shared), dtype=bool)
+        for index in members:
+            start_x, start_y, facing_angle, _, cone_angle = cones[index]
+            start_angle = facing_angle - cone_angle / 2
+            in_range = _in_range(start_x, start_y, cone_length, shared)
+            reachable |= in_range
+            if mode == "sweep":
+                offsets = _sweep_offsets(
+                    start_x, start_y, start_angle, cone_length, cone_angle, shared[in_range], arc_step
+                )
+            else:
+                offsets = _fan_offsets(cone_angle, step_angle)
+            ray_offsets.append(offsets)
+
+        counts = [len(offsets) for offsets in ray_offsets]
+        origin_x = np.repeat([cones[index][0] for index in members], counts)
+        origin_y = np.repeat([cones[index][1] for index in members], counts)
+        angles = np.concatenate([
+            cones[index][2] - cones[index][4] / 2 + offsets
+            for index, offsets in zip(members, ray_offsets)
+        ])
+        points = cast_rays(origin_x, origin_y, angles.tolist(), cone_length, shared[reachable])
+
+        for index, offsets, cone_points in zip(members, ray_offsets, np.split(points, np.cumsum(counts)[:-1])):
+            start_x, start_y, facing_angle, _, cone_angle = cones[index]
+            polygons[index] = VisibilityPolygon(
+                start_x, start_y, facing_angle - cone_angle / 2, cone_length, cone_angle,
+                offsets, cone_points,
+            )
+
+    return polygons
@@ -0,0 +1,126 @@
+# visibility_engine.py
+
+import numpy as np
+
+
+class VisibleSet:
+    """
+    Objects seen by at least one viewer this frame, deduplicated by identity,
+    with a per-category breakdown (e.g. walls, pickups, enemies).
+    """
+
+    def __init__(self, categories):
+        self.ids = set()
+        self.by_category = {name: [] for name in categories}
+
+    def add(self, category, obj):
+        self.ids.add(id(obj))
+        self.by_category[category].append(obj)
+
+    def __contains__(self, obj):
+        return id(obj) in self.ids
+
+    def __iter__(self):
+        for objects in self.by_category.values():
+            yield from objects
+
+    def __len__(self):
+        return len(self.ids)
+
+    def counts(self):
+        return {name: len(objects) for name, objects in self.by_category.items()}
+
+
+class Viewer:
+    """
+    A cone to test visibility from; polygon is its exact lit area when one has been computed.
+    """
+
+    def __init__(self, x, y, facing_angle, cone_length, cone_angle, polygon=None):
+        self.x = x
+        self.y = y
+        self.facing_angle = facing_angle
+        self.cone_length = cone_length
+        self.cone_angle = cone_angle
+        self.polygon = polygon
+
+
+def _positions(objects):
+    return np.array([(obj.center_x, obj.center_y) for obj in objects], dtype=float).reshape(-1, 2)
+
+
+class VisibilityEngine:
+    """
+    Computes everything visible from a set of viewer cones in one pass per frame.
+    A vectorized range/angle test over all viewer/object pairs runs first; line of sight
+    (or the viewer's lit polygon) is only checked for the survivors, and only until an
+    object has been seen once.
+    """
+
+    def __init__(self, line_of_sight):
+        self.line_of_sight = line_of_sight
+
+        # Positions of categories that never move, cached per sprite list
+        self.static_positions = {}
+
+    def set_static(self, category, objects):
+        """
+        Cache the positions of a category that does not move (e.g. walls after load_map).
+        """
+        self.static_positions[category] = (objects, _positions(objects))
+
+    def compute(self, viewers, categories):
+        """
+        viewers: list of Viewer; categories: dict of category name -> sprites.
+        Returns a VisibleSet.
+        """
+        visible = VisibleSet(categories)
+        if not viewers:
+            return visible
+
+        # Flatten all categories into one object array
+        objects = []
+        owners = []
+        positions = []
+        for category, sprites in categories.items():
+            cached = self.static_positions.get(category)
+            if cached is not None and cached[0] is sprites and len(cached[1]) == len(sprites):
+                positions.append(cached[1])
+            else:
+                positions.append(_positions(sprites))
+            objects.extend(sprites)
+            owners.extend([category] * len(sprites))
+        if not objects:
+            return visible
+        positions = np.concatenate(positions)
+
+        viewer_x = np.array([v.x for v in viewers], dtype=float)[None, :]
+        viewer_y = np.array([v.y for v in viewers], dtype=float)[None, :]
+        facing = np.array([v.facing_angle for v in viewers], dtype=float)[None, :]
+        length = np.array([v.cone_length for v in viewers], dtype=float)[None, :]
+        half_angle = np.array([v.cone_angle / 2 for v in viewers], dtype=float)[None, :]
+
+        # Range and angle pre-filter for every object (rows) against every viewer (columns)
+        dx = positions[:, 0:1] - viewer_x
+        dy = positions[:, 1:2] - viewer_y
+        angle_difference = np.abs((np.degrees(np.arctan2(dy, dx)) - facing + 180) % 360 - 180)
+        in_cone = (np.hypot(dx, dy) < length) & (angle_difference < half_angle)
+
+        # Walls are only checked for survivors, and never again once an object is seen
+        seen = -1
+        for index, viewer_index in zip(*np.nonzero(in_cone)):
+            if index == seen:
+                continue
+            obj = objects[index]
+            viewer = viewers[viewer_index]
+            if viewer.polygon is not None:
+                is_visible = viewer.polygon.contains(obj.center_x, obj.center_y)
+            else:
+                is_visible = self.line_of_sight.is_clear(
+                    viewer.x, viewer.y, obj.center_x, obj.center_y
+                )
+            if is_visible:
+                visible.add(owners[index], obj)
+                seen = index
+
+        return visible
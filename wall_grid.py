@@ -0,0 +1,153 @@
+# wall_grid.py
+
+import math
+
+import numpy as np
+
+from constants import WALL_GRID_CELL_SIZE
+from raycast import segment_intersections
+
+# Edges are registered slightly beyond their extent so segments grazing a cell corner still see them
+CELL_PADDING = 1.0
+
+_NO_EDGES = np.empty(0, dtype=np.intp)
+
+
+class WallGrid:
+    """
+    Uniform grid over the static wall edges of an EdgeTable.
+    Segment queries only test the edges registered in the cells the segment passes through.
+    """
+
+    def __init__(self, edge_table, cell_size=WALL_GRID_CELL_SIZE):
+        self.edge_table = edge_table
+        self.edges = edge_table.edges
+        self.cell_size = cell_size
+
+        buckets = {}
+        for index, (x1, y1, x2, y2) in enumerate(self.edges.tolist()):
+            min_cx, min_cy = self.cell_of(min(x1, x2) - CELL_PADDING, min(y1, y2) - CELL_PADDING)
+            max_cx, max_cy = self.cell_of(max(x1, x2) + CELL_PADDING, max(y1, y2) + CELL_PADDING)
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    buckets.setdefault((cx, cy), []).append(index)
+
+        self.cells = {cell: np.array(indices, dtype=np.intp) for cell, indices in buckets.items()}
+
+    def cell_of(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def cells_on_segment(self, x1, y1, x2, y2):
+        """
+        Yields every cell the segment passes through, in order (Amanatides-Woo traversal).
+        """
+        gx1, gy1 = x1 / self.cell_size, y1 / self.cell_size
+        gx2, gy2 = x2 / self.cell_size, y2 / self.cell_size
+        cx, cy = math.floor(gx1), math.floor(gy1)
+        end_cx, end_cy = math.floor(gx2), math.floor(gy2)
+        dx, dy = gx2 - gx1, gy2 - gy1
+
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        t_delta_x = abs(1 / dx) if dx else math.inf
+        t_delta_y = abs(1 / dy) if dy else math.inf
+        t_max_x = ((cx + 1 - gx1) if dx > 0 else (gx1 - cx)) * t_delta_x if dx else math.inf
+        t_max_y = ((cy + 1 - gy1) if dy > 0 else (gy1 - cy)) * t_delta_y if dy else math.inf
+
+        yield cx, cy
+        for _ in range(abs(end_cx - cx) + abs(end_cy - cy)):
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            yield cx, cy
+
+    def segment_candidates(self, x1, y1, x2, y2):
+        """
+        Returns the sorted indices of every edge registered along the segment.
+        """
+        found = [
+            self.cells[cell]
+            for cell in self.cells_on_segment(x1, y1, x2, y2)
+            if cell in self.cells
+        ]
+        if not found:
+            return _NO_EDGES
+        return np.unique(np.concatenate(found))
+
+    def rect_candidates(self, left, bottom, right, top):
+        """
+        Returns the sorted indices of every edge registered in cells overlapping the rectangle.
+        """
+        min_cx, min_cy = self.cell_of(left, bottom)
+        max_cx, max_cy = self.cell_of(right, top)
+        found = [
+            self.cells[(cx, cy)]
+            for cx in range(min_cx, max_cx + 1)
+            for cy in range(min_cy, max_cy + 1)
+            if (cx, cy) in self.cells
+        ]
+        if not found:
+            return _NO_EDGES
+        return np.unique(np.concatenate(found))
+
+    def candidates_near(self, x, y, radius):
+        """
+        Returns the edges that segments of up to radius starting at (x, y) could hit.
+        """
+        return self.rect_candidates(x - radius, y - radius, x + radius, y + radius)
+
+    def cell_key(self, x, y, radius):
+        """
+        Broad-phase cell of a point; points with the same key share candidates_in_cell for
+        any one radius. The key does not depend on radius (callers pass radius to
+        candidates_in_cell separately and group by it themselves); it is only accepted so
+        WallGrid and PotentiallyVisibleSet can be used interchangeably.
+        """
+        return self.cell_of(x, y)
+
+    def candidates_in_cell(self, x, y, radius):
+        """
+        Returns the edges that segments of up to radius starting anywhere in the cell of (x, y) could hit.
+        """
+        cx, cy = self.cell_of(x, y)
+        return self.rect_candidates(
+            cx * self.cell_size - radius, cy * self.cell_size - radius,
+            (cx + 1) * self.cell_size + radius, (cy + 1) * self.cell_size + radius,
+        )
+
+    def first_hit(self, x1, y1, x2, y2):
+        """
+        Finds the wall edge hit closest to (x1, y1) along the segment.
+        Returns (intersect_x, intersect_y, edge_index) or None if the segment is clear.
+        """
+        candidates = self.segment_candidates(x1, y1, x2, y2)
+        if len(candidates) == 0:
+            return None
+
+        hit, intersect_x, intersect_y = segment_intersections(
+            float(x1), float(y1), float(x2), float(y2), self.edges[candidates]
+        )
+        hit, intersect_x, intersect_y = hit[0], intersect_x[0], intersect_y[0]
+        if not hit.any():
+            return None
+
+        distance = np.where(hit, np.hypot(intersect_x - x1, intersect_y - y1), np.inf)
+        closest = int(np.argmin(distance))
+        return float(intersect_x[closest]), float(intersect_y[closest]), int(candidates[closest])
+
+    def segment_blocked(self, x1, y1, x2, y2):
+        """
+        Returns True if the segment crosses any wall edge.
+        """
+        for cell in self.cells_on_segment(x1, y1, x2, y2):
+            indices = self.cells.get(cell)
+            if indices is not None:
+                hit, _, _ = segment_intersections(
+                    float(x1), float(y1), float(x2), float(y2), self.edges[indices]
+                )
+                if hit.any():
+                    return True
+        return False
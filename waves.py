@@ -0,0 +1,69 @@
+# waves.py
+
+from pools import SpritePool
+from constants import WAVE_PREFETCH_PER_STEP, WAVE_TRANSITION_FRAMES
+
+
+def wave_size(wave_number):
+    """
+    (enemies, bosses) that make up a wave: every fifth wave is a lone boss.
+    """
+    if wave_number % 5 == 0:
+        return 0, 1
+    return wave_number, 0
+
+
+class WaveManager:
+    """
+    Builds each wave's actors ahead of time so starting a wave is cheap. Killed actors go
+    back to the pools, and while a wave is played whatever the next one needs beyond them
+    is constructed a few per step; when it starts the sprites only need their state reset,
+    positions and a place in the sprite lists. The pools are
+    filled for the first boss up front, which pays its texture loading at setup instead
+    of mid-game. Also keeps the worst frame time seen just after each wave started.
+    """
+
+    def __init__(self, enemy_factory, boss_factory, per_step=WAVE_PREFETCH_PER_STEP,
+                 transition_frames=WAVE_TRANSITION_FRAMES):
+        self.enemy_pool = SpritePool(enemy_factory)
+        self.boss_pool = SpritePool(boss_factory, 1)
+        self.per_step = per_step
+        self.transition_frames = transition_frames
+
+        # Worst frame time (seconds) within transition_frames frames of each wave's start
+        self.worst_frames = {}
+        self.wave_number = None
+        self.frames_since_start = transition_frames
+
+    def prefetch(self, wave_number):
+        """
+        Build up to per_step more of the sprites wave wave_number will need.
+        """
+        enemies, bosses = wave_size(wave_number)
+        budget = self.per_step
+        budget -= self.boss_pool.reserve(bosses, budget)
+        self.enemy_pool.reserve(enemies, budget)
+
+    def started(self, wave_number):
+        """
+        The next wave has just been spawned; the following frames count as its transition.
+        """
+        self.wave_number = wave_number
+        self.frames_since_start = 0
+
+    def record_frame(self, seconds):
+        """
+        Report how long a frame (or simulation step) took.
+        """
+        if self.frames_since_start < self.transition_frames:
+            self.frames_since_start += 1
+            worst = self.worst_frames.get(self.wave_number, 0.0)
+            self.worst_frames[self.wave_number] = max(worst, seconds)
+
+    def worst_transition(self):
+        """
+        Returns (wave_number, seconds) of the slowest frame around any wave start, or None.
+        """
+        if not self.worst_frames:
+            return None
+        return max(self.worst_frames.items(), key=lambda item: item[1])
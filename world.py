@@ -0,0 +1,802 @@
+# world.py
+
+import argparse
+import json
+import math
+import random
+import time
+from itertools import chain
+
+import arcade
+import numpy as np
+
+from constants import *
+from enemy import Enemy
+from boss import Boss
+from player import Player
+from bullets import BulletSystem
+from pools import AllocationReport
+from pickups import PickupManager
+from wall import Wall
+from edge_table import EdgeTable
+from wall_grid import WallGrid
+from pvs import PotentiallyVisibleSet
+from line_of_sight import LineOfSightService
+from collision import CollisionResolver
+from neighbors import NeighborIndex
+from crowd import separation, steer
+from ai_scheduler import AIScheduler
+from navigation import FlowField
+from targeting import TargetSelector
+from spawning import SpawnPlanner
+from waves import WaveManager, wave_size
+
+DEFAULT_MAP = "resources/assets/map1.json"
+
+
+def _new_enemy():
+    return Enemy(
+        "resources/Images/enemy.png",          # Standing texture
+        "resources/Images/enemy.png",          # First walking frame (reused)
+        "resources/Images/enemy.png",          # Second walking frame (reused)
+        ENEMY_SCALING,
+    )
+
+
+def _new_boss():
+    return Boss(
+        "resources/Images/boss.png",  # Path to the boss image
+        "resources/Images/boss.png",
+        "resources/Images/boss.png",
+        BOSS_SCALING,
+    )
+
+
+class PlayerInput:
+    """
+    What the player does during one step: movement direction (-1, 0 or 1 per axis)
+    and the world point being aimed at.
+    """
+
+    def __init__(self, move_x=0, move_y=0, aim_x=0.0, aim_y=0.0):
+        self.move_x = move_x
+        self.move_y = move_y
+        self.aim_x = aim_x
+        self.aim_y = aim_y
+
+
+class World:
+    """
+    The whole game simulation: player, enemies, bosses, bullets, pickups, walls and waves.
+    Needs no window or camera, so it can be stepped faster than real time on a headless box.
+    Sounds are not played here; step() records them as events for the renderer to play.
+    """
+
+    def __init__(self):
+        # Sprite lists are lazy so nothing touches OpenGL until they are first drawn
+        self.player_list = arcade.SpriteList(lazy=True)
+        self.enemy_list = arcade.SpriteList(lazy=True)
+        self.boss_list = arcade.SpriteList(lazy=True)
+        self.bullets = BulletSystem()
+        self.wall_list = arcade.SpriteList(lazy=True)
+
+        # Capped, despawning ammo and health pickups
+        self.pickups = PickupManager()
+        self.ammo_pickup_list = self.pickups.sprite_list('ammo')
+        self.health_pickup_list = self.pickups.sprite_list('health')
+
+        # Enemies and bosses of the next wave, built a few per step while the current one is played
+        self.wave_manager = WaveManager(_new_enemy, _new_boss)
+
+        # What the pickup, enemy and boss pools and bullet arrays allocate each wave
+        self.allocation_report = AllocationReport({
+            "ammo_pickups": self.pickups.pool('ammo'),
+            "health_pickups": self.pickups.pool('health'),
+            "enemies": self.wave_manager.enemy_pool,
+            "bosses": self.wave_manager.boss_pool,
+            "bullets": self.bullets,
+        })
+
+        # Packed wall edges used by every ray and line-of-sight query
+        self.wall_edges = EdgeTable()
+        self.wall_grid = WallGrid(self.wall_edges)
+
+        # Per-cell wall lists for the loaded map; ray and line-of-sight queries go through it
+        self.wall_pvs = None
+        self.wall_queries = self.wall_grid
+
+        # Step-scoped line-of-sight answers shared by shooting, AI and visibility
+        self.line_of_sight = LineOfSightService(self.wall_queries)
+
+        # Swept wall collisions for the player, enemies and bosses
+        self.collision_resolver = CollisionResolver(self.wall_edges, self.wall_grid)
+
+        # Shared paths around the walls toward the player for enemies and bosses
+        self.flow_field = FlowField(self.collision_resolver.rects)
+
+        # Wall-aware placement of enemy waves and random pickups
+        self.spawn_planner = SpawnPlanner(self.collision_resolver.rects)
+
+        # Positions of the enemies whose AI ran this tick, then the bosses, for neighbor queries,
+        # with the sprites they belong to and which of them are bosses
+        self.actor_index = NeighborIndex()
+        self.actor_sprites = []
+        self.actor_is_boss = np.empty(0, dtype=bool)
+
+        # What the player's auto-fire aims at
+        self.targeting = TargetSelector()
+
+        # Which enemies run their AI and move each tick
+        self.ai_scheduler = AIScheduler()
+
+        # Simulated seconds so far
+        self.time = 0.0
+
+        # Random stream for enemy AI decisions, seeded from the random module so seeded runs repeat
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+        # Initialize player
+        self.player_sprite = None
+
+        # Ammo spawn timer
+        self.ammo_spawn_timer = 0
+
+        # Wave number
+        self.wave_number = 1
+
+        # Player death handling
+        self.player_dead = False
+
+        # Enemies killed count
+        self.enemies_killed = 0
+
+        # Boss defeated count
+        self.bosses_defeated = 0
+
+        # Flag to check if boss is active
+        self.boss_active = False
+
+        # Names of the AudioManager methods to call for what happened since the last drain
+        self.events = []
+
+    def setup(self, map_file=DEFAULT_MAP):
+        # Create the player at the center of the world
+        self.player_sprite = Player(
+            "resources/Images/top_View-removedbg.png",  # Standing texture
+            "resources/Images/Moving1.png",             # First walking frame
+            "resources/Images/Moving2.png",             # Second walking frame
+            PLAYER_SCALING,
+        )
+        self.player_sprite.center_x = WORLD_CENTER_X
+        self.player_sprite.center_y = WORLD_CENTER_Y
+        self.player_list.append(self.player_sprite)
+
+        self.load_map(map_file)
+
+        # Spawn the initial wave of enemies, clear of the walls just loaded
+        self.spawn_enemies()
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def drain_events(self):
+        """
+        Returns the sound events recorded since the last call and forgets them.
+        """
+        events = self.events
+        self.events = []
+        return events
+
+    def high_score(self):
+        return self.enemies_killed + self.bosses_defeated * 50
+
+    def load_map(self, map_file):
+        # Clear existing walls
+        self.wall_list = arcade.SpriteList(lazy=True)
+
+        # Load the map data
+        with open(map_file, "r") as f:
+            map_data = json.load(f)
+
+        for wall_data in map_data["walls"]:
+            x, y = wall_data["x"], wall_data["y"]
+            width, height = wall_data["width"], wall_data["height"]
+
+            # Check if the wall is within the circular world boundary
+            dx = x - WORLD_CENTER_X
+            dy = y - WORLD_CENTER_Y
+            if math.hypot(dx, dy) + max(width, height) / 2 <= WORLD_RADIUS:
+                wall = Wall(width, height, arcade.color.GRAY, x, y)
+                self.wall_list.append(wall)
+
+        # Rebuild the wall geometry and everything that queries it now that the wall set has changed
+        self.wall_edges = EdgeTable(self.wall_list)
+        self.wall_grid = WallGrid(self.wall_edges)
+        self.wall_pvs = PotentiallyVisibleSet.load_or_build(map_file, self.wall_grid)
+        self.wall_queries = self.wall_pvs
+        self.line_of_sight = LineOfSightService(self.wall_queries)
+        self.collision_resolver = CollisionResolver(self.wall_edges, self.wall_grid)
+        self.bullets.set_walls(self.collision_resolver.rects)
+        self.flow_field = FlowField(self.collision_resolver.rects)
+        self.spawn_planner = SpawnPlanner(self.collision_resolver.rects)
+
+    def spawn_enemies(self):
+        num_enemies, num_bosses = wave_size(self.wave_number)
+        if num_bosses and not self.boss_active:
+            # Spawn the boss
+            self.spawn_boss()
+            self.boss_active = True
+        else:
+            # Spawn regular enemies, placing the whole wave at once; the sprites were built ahead
+            positions = self.spawn_planner.place(
+                self.rng, num_enemies, self.player_sprite.center_x, self.player_sprite.center_y
+            )
+            # Everything still scheduled belongs to the last wave, whose sprites are about to be reused
+            self.ai_scheduler.clear()
+            for x, y in zip(*(column.tolist() for column in positions)):
+                enemy_sprite = self.wave_manager.enemy_pool.acquire()
+                enemy_sprite.health = ENEMY_HEALTH + (self.wave_number - 1) * 10
+                enemy_sprite.center_x = x
+                enemy_sprite.center_y = y
+                # A reused sprite must not be drawn sliding in from where it last died
+                enemy_sprite.previous_position = enemy_sprite.position
+                self.enemy_list.append(enemy_sprite)
+                self.ai_scheduler.add(enemy_sprite, self.time)
+
+    def spawn_boss(self):
+        boss_sprite = self.wave_manager.boss_pool.acquire()
+        boss_sprite.health = BOSS_HEALTH
+        boss_sprite.center_x = WORLD_CENTER_X
+        boss_sprite.center_y = WORLD_CENTER_Y - 400  # Spawn position
+        boss_sprite.previous_position = boss_sprite.position
+        self.boss_list.append(boss_sprite)
+
+        # Play the boss sound
+        self.emit("play_boss_sound")
+
+    def recycle_actor(self, sprite, pool):
+        """
+        Return a killed enemy or boss to its pool, in the state of a newly built one.
+        """
+        sprite.change_x = 0
+        sprite.change_y = 0
+        sprite.angle = 0
+        sprite.shoot_timer = 0
+        sprite.time_since_last_fire = 0
+        sprite.frame_count = 0
+        sprite.current_frame = 0
+        sprite.texture = sprite.standing_texture
+        pool.release(sprite)
+
+    def spawn_ammo_pickup_at(self, x, y):
+        self.pickups.spawn('ammo', x, y)
+
+    def spawn_health_pickup_at(self, x, y):
+        self.pickups.spawn('health', x, y)
+
+    def spawn_ammo_pickup(self):
+        x, y = self.spawn_planner.place(
+            self.rng, 1, self.player_sprite.center_x, self.player_sprite.center_y
+        )
+        # No clear spot left on the map: skip this pickup
+        if len(x):
+            self.spawn_ammo_pickup_at(float(x[0]), float(y[0]))
+
+    def step(self, delta_time, inputs):
+        """
+        Advance the game by one simulation step of delta_time seconds, with the player
+        acting on inputs (a PlayerInput).
+        """
+        if self.player_dead:
+            # Stop boss sound if player dies
+            self.emit("stop_boss_sound")
+            return
+
+        self.time += delta_time
+
+        # Line-of-sight answers from the previous step are stale once anything moves
+        self.line_of_sight.begin_frame()
+
+        # Enemies whose AI runs this tick; the others are left alone until their turn
+        enemies = self.ai_scheduler.due()
+        elapsed = [self.time - enemy.ai_moved_at for enemy in enemies]
+
+        # Move the player in the direction held this step
+        self.player_sprite.change_x = inputs.move_x * PLAYER_MOVEMENT_SPEED
+        self.player_sprite.change_y = inputs.move_y * PLAYER_MOVEMENT_SPEED
+
+        # Update sprites
+        self.player_list.update()
+        for enemy in enemies:
+            enemy.update()
+        self.boss_list.update()
+        self.bullets.update(delta_time)
+        self.pickups.update(delta_time)
+
+        # Move the player, bosses and due enemies, stopping at and sliding along walls;
+        # enemies catch up on everything they moved since their last turn in one swept move
+        movers = list(chain(self.player_list, self.boss_list))
+        self.collision_resolver.move(
+            movers + enemies, [delta_time] * len(movers) + elapsed
+        )
+        for enemy in enemies:
+            enemy.ai_moved_at = self.time
+
+        # Smoothly rotate the player to face the aim point
+        target_angle = math.degrees(
+            math.atan2(
+                inputs.aim_y - self.player_sprite.center_y,
+                inputs.aim_x - self.player_sprite.center_x,
+            )
+        )
+        current_angle = self.player_sprite.angle
+
+        # Calculate the shortest rotation direction
+        angle_diff = (target_angle - current_angle + 180) % 360 - 180
+
+        # Set a rotation speed
+        rotation_speed = 300 * delta_time  # Degrees per second
+
+        # Update the angle with a clamped rotation
+        if abs(angle_diff) < rotation_speed:
+            self.player_sprite.angle = target_angle
+        else:
+            self.player_sprite.angle += rotation_speed * (1 if angle_diff > 0 else -1)
+
+        # Keep player within world circle
+        self.keep_sprite_within_world(self.player_sprite)
+
+        # Spawn ammo pickups
+        self.ammo_spawn_timer += delta_time
+        if self.ammo_spawn_timer >= AMMO_SPAWN_INTERVAL:
+            self.spawn_ammo_pickup()
+            self.ammo_spawn_timer = 0
+
+        # Handle bullets
+        self.handle_bullets()
+
+        # Enemies these bullets killed are back in their pool; their AI must not run any more
+        alive = [index for index, enemy in enumerate(enemies) if enemy.sprite_lists]
+        if len(alive) < len(enemies):
+            enemies = [enemies[index] for index in alive]
+            elapsed = [elapsed[index] for index in alive]
+
+        # Re-aim the shared paths at the player; rebuilt only when the player changes cell
+        self.flow_field.set_goal(self.player_sprite.center_x, self.player_sprite.center_y)
+
+        # Handle enemies
+        self.handle_enemies(enemies, elapsed, delta_time)
+
+        # Handle bosses
+        self.handle_bosses(delta_time)
+
+        # Handle player shooting
+        self.handle_player_shooting(delta_time)
+
+        # Handle pickups
+        self.handle_pickups()
+
+        # Handle player walking sound
+        if self.player_sprite.change_x != 0 or self.player_sprite.change_y != 0:
+            self.emit("play_player_walk_sound")
+        else:
+            self.emit("stop_player_walk_sound")
+
+        # Check for wave completion
+        if not self.enemy_list and not self.boss_list:
+            self.allocation_report.end_wave(self.wave_number)
+            self.wave_number += 1
+            self.boss_active = False
+            self.spawn_enemies()
+            self.wave_manager.started(self.wave_number)
+
+        # Spread building the next wave's sprites over this wave's steps
+        self.wave_manager.prefetch(self.wave_number + 1)
+
+    def keep_sprite_within_world(self, sprite):
+        dx = sprite.center_x - WORLD_CENTER_X
+        dy = sprite.center_y - WORLD_CENTER_Y
+        distance = math.hypot(dx, dy)
+        if distance > WORLD_RADIUS:
+            angle = math.atan2(dy, dx)
+            sprite.center_x = WORLD_CENTER_X + WORLD_RADIUS * math.cos(angle)
+            sprite.center_y = WORLD_CENTER_Y + WORLD_RADIUS * math.sin(angle)
+
+    def handle_bullets(self):
+        # Find where each bullet's path this step ends at the world edge or a wall
+        self.bullets.stop_at_world_edge()
+        self.bullets.stop_at_walls()
+
+        # Resolve hits on the player, enemies and bosses before that point, then drop the stopped bullets
+        self.bullets.collide(
+            {'player': self.player_list, 'enemy': self.enemy_list, 'boss': self.boss_list},
+            self.handle_bullet_hit,
+        )
+        self.bullets.remove_stopped()
+
+    def handle_bullet_hit(self, owner, target, damage):
+        """
+        Apply one bullet hit. Returns True once the player is dead, to stop resolving hits.
+        """
+        if isinstance(target, Enemy):
+            target.health -= damage
+            if target.health <= 0:
+                self.enemies_killed += 1
+                # Drop health pack if player's health is below 20
+                if self.player_sprite.health < 20:
+                    self.spawn_health_pickup_at(target.center_x, target.center_y)
+                else:
+                    self.spawn_ammo_pickup_at(target.center_x, target.center_y)
+                self.recycle_actor(target, self.wave_manager.enemy_pool)
+                self.emit("play_enemy_die_sound")
+            else:
+                # Play player hit enemy sound
+                self.emit("play_player_kill_enemy_sound")
+
+        elif isinstance(target, Boss):
+            target.health -= damage
+            if target.health <= 0:
+                self.bosses_defeated += 1
+                # Restore player's health to full
+                self.player_sprite.health = PLAYER_HEALTH
+                self.recycle_actor(target, self.wave_manager.boss_pool)
+                self.emit("play_enemy_die_sound")
+                self.emit("stop_boss_sound")  # Stop boss sound
+            else:
+                # Play player hit boss sound
+                self.emit("play_player_kill_enemy_sound")
+
+        else:
+            # Enemy or boss bullet hit the player
+            self.player_sprite.health -= damage
+            if self.player_sprite.health <= 0:
+                self.player_sprite.texture = self.player_sprite.dead_texture
+                self.emit("stop_game_sound")
+                self.emit("stop_player_walk_sound")
+                self.emit("stop_enemy_near_player_sound")
+                self.emit("play_player_die_sound")
+                self.emit("stop_boss_sound")
+                self.player_dead = True
+                return True
+        return False
+
+    def handle_player_shooting(self, delta_time):
+        if self.player_sprite.shoot_timer > 0:
+            self.player_sprite.shoot_timer -= delta_time
+
+        # Nothing to aim for until a shot can actually be fired
+        if self.player_sprite.ammo <= 0 or self.player_sprite.shoot_timer > 0:
+            return
+
+        target = self.targeting.select(
+            self.player_sprite, self.actor_index, self.actor_sprites, self.actor_is_boss,
+            self.has_line_of_sight,
+        )
+        if target is not None:
+            self.bullets.spawn(
+                self.player_sprite.center_x, self.player_sprite.center_y,
+                self.player_sprite.angle, 'player',
+            )
+            self.player_sprite.shoot_timer = PLAYER_FIRE_RATE
+            self.player_sprite.ammo -= 1
+
+    def is_within_cone(self, sprite, target_x, target_y, facing_angle, cone_length, cone_angle):
+        dx = target_x - sprite.center_x
+        dy = target_y - sprite.center_y
+        distance = math.hypot(dx, dy)
+        angle_to_target = math.degrees(math.atan2(dy, dx))
+        angle_difference = abs((angle_to_target - facing_angle + 180) % 360 - 180)
+        return distance < cone_length and angle_difference < (cone_angle / 2)
+
+    def handle_enemies(self, enemies, elapsed, delta_time):
+        """
+        Run the AI of the enemies due this tick as whole-array operations: positions, velocities,
+        facing and timers are read once, decided together and only changed values written back.
+        elapsed holds each enemy's seconds since its last AI update (delta_time when engaged).
+        """
+        elapsed = np.asarray(elapsed, dtype=float)
+        x = np.array([enemy.center_x for enemy in enemies], dtype=float)
+        y = np.array([enemy.center_y for enemy in enemies], dtype=float)
+        old_change_x = np.array([enemy.change_x for enemy in enemies], dtype=float)
+        old_change_y = np.array([enemy.change_y for enemy in enemies], dtype=float)
+        old_angle = np.array([enemy.angle for enemy in enemies], dtype=float)
+        old_shoot_timer = np.array([enemy.shoot_timer for enemy in enemies], dtype=float)
+        old_since_fire = np.array([enemy.time_since_last_fire for enemy in enemies], dtype=float)
+        change_x, change_y, angle = old_change_x.copy(), old_change_y.copy(), old_angle.copy()
+        shoot_timer, since_fire = old_shoot_timer.copy(), old_since_fire.copy()
+
+        # Keep enemies within world circle
+        from_center_x = x - WORLD_CENTER_X
+        from_center_y = y - WORLD_CENTER_Y
+        outside = np.flatnonzero(np.hypot(from_center_x, from_center_y) > WORLD_RADIUS)
+        bearing = np.arctan2(from_center_y[outside], from_center_x[outside])
+        x[outside] = WORLD_CENTER_X + WORLD_RADIUS * np.cos(bearing)
+        y[outside] = WORLD_CENTER_Y + WORLD_RADIUS * np.sin(bearing)
+
+        # Enemies that detect the player turn to face it
+        player_x, player_y = self.player_sprite.center_x, self.player_sprite.center_y
+        to_player_x = player_x - x
+        to_player_y = player_y - y
+        distance_to_player = np.hypot(to_player_x, to_player_y)
+        detected = distance_to_player <= ENEMY_DETECTION_RANGE
+        angle[detected] = np.degrees(np.arctan2(to_player_y[detected], to_player_x[detected]))
+
+        # Out of shooting range they close in along the flow field, within it they stop
+        chasing = detected & (distance_to_player > ENEMY_SHOOT_RANGE)
+        holding = detected & ~chasing
+        change_x[chasing], change_y[chasing] = self.chase_velocity(x[chasing], y[chasing], ENEMY_MOVEMENT_SPEED)
+        change_x[holding] = 0
+        change_y[holding] = 0
+
+        # Shoot at player; having just turned to face it, the cone test reduces to the range
+        ready = holding & (shoot_timer <= 0)
+        cooling = holding & ~ready
+        fired = np.zeros(len(enemies), dtype=bool)
+        shooters = np.flatnonzero(ready & (distance_to_player < ENEMY_SHOOT_RANGE))
+        if len(shooters) > AI_LOS_BUDGET:
+            # Over the line-of-sight budget: those waiting longest to fire go first, the rest next tick
+            shooters = np.sort(shooters[np.argsort(-since_fire[shooters], kind='stable')[:AI_LOS_BUDGET]])
+        for index in shooters.tolist():
+            if self.has_line_of_sight_to_point(float(x[index]), float(y[index]), player_x, player_y):
+                self.bullets.spawn(float(x[index]), float(y[index]), float(angle[index]), 'enemy')
+                fired[index] = True
+        shoot_timer[fired] = ENEMY_SHOOT_DELAY
+        since_fire[fired] = 0
+
+        # Enemy cannot fire yet
+        shoot_timer[cooling] -= elapsed[cooling]
+        since_fire[cooling] += elapsed[cooling]
+        # Increment time since last fire if enemy didn't shoot
+        waiting = detected & (shoot_timer > 0)
+        since_fire[waiting] += elapsed[waiting]
+
+        # Enemies too far from the player occasionally pick a new random direction,
+        # with a 2% chance per tick since their last update
+        wandering = np.flatnonzero(~detected)
+        turn_chance = 1 - 0.98 ** (elapsed[wandering] / delta_time)
+        turning = wandering[self.rng.random(len(wandering)) < turn_chance]
+        change_x[turning] = self.rng.uniform(-ENEMY_MOVEMENT_SPEED, ENEMY_MOVEMENT_SPEED, len(turning))
+        change_y[turning] = self.rng.uniform(-ENEMY_MOVEMENT_SPEED, ENEMY_MOVEMENT_SPEED, len(turning))
+        moving = wandering[(change_x[wandering] != 0) | (change_y[wandering] != 0)]
+        angle[moving] = np.degrees(np.arctan2(change_y[moving], change_x[moving]))
+        since_fire[wandering] += elapsed[wandering]
+
+        # Every enemy within CONE_LENGTH of the player runs its AI each tick (see AI_LOD_TIERS),
+        # so this index also holds everything the player's auto-fire can target
+        self.index_actors(enemies, x, y)
+
+        # Keep enemies closing in on the player from stacking on the same spot
+        if CROWD_STEERING:
+            self.steer_crowd(change_x, change_y, detected)
+
+        # Write back only what changed
+        for index, new_x, new_y in zip(outside.tolist(), x[outside].tolist(), y[outside].tolist()):
+            enemies[index].position = (new_x, new_y)
+        for name, old, new in (
+            ("change_x", old_change_x, change_x),
+            ("change_y", old_change_y, change_y),
+            ("angle", old_angle, angle),
+            ("shoot_timer", old_shoot_timer, shoot_timer),
+            ("time_since_last_fire", old_since_fire, since_fire),
+        ):
+            for index, value in zip(np.flatnonzero(new != old).tolist(), new[new != old].tolist()):
+                setattr(enemies[index], name, value)
+
+        # Engaged enemies run again next tick, wandering ones later
+        self.ai_scheduler.reschedule(enemies, distance_to_player)
+
+        # Play or stop the enemy near player sound
+        if detected.any():
+            self.emit("play_enemy_near_player_sound")
+        else:
+            self.emit("stop_enemy_near_player_sound")
+
+    def chase_velocity(self, x, y, speed):
+        """
+        (change_x, change_y) arrays that move actors at (x, y) toward the player at speed,
+        around walls along the flow field, or in a straight line where it cannot help.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        direction_x, direction_y, reachable = self.flow_field.direction_at(x, y)
+
+        # Actors the field cannot route head straight for the player, as before
+        stuck = ~reachable
+        to_player_x = self.player_sprite.center_x - x[stuck]
+        to_player_y = self.player_sprite.center_y - y[stuck]
+        length = np.maximum(np.hypot(to_player_x, to_player_y), 1e-9)
+        direction_x[stuck] = to_player_x / length
+        direction_y[stuck] = to_player_y / length
+        return speed * direction_x, speed * direction_y
+
+    def index_actors(self, enemies, x, y):
+        """
+        Re-index the enemies running their AI this tick (at x, y) followed by the bosses.
+        """
+        self.actor_index.rebuild(
+            np.concatenate((x, [boss.center_x for boss in self.boss_list])),
+            np.concatenate((y, [boss.center_y for boss in self.boss_list])),
+        )
+        self.actor_sprites = list(chain(enemies, self.boss_list))
+        self.actor_is_boss = np.arange(len(self.actor_sprites)) >= len(enemies)
+
+    def steer_crowd(self, change_x, change_y, near):
+        """
+        Push every indexed enemy flagged in near away from its neighbors so the crowd spreads
+        out around the player. Updates change_x and change_y in place.
+        """
+        near = np.flatnonzero(near)
+        if len(near) == 0:
+            return
+
+        push_x, push_y = separation(self.actor_index, CROWD_SEPARATION_RADIUS)
+        change_x[near], change_y[near] = steer(
+            change_x[near], change_y[near], push_x[near], push_y[near],
+            CROWD_SEPARATION_WEIGHT, ENEMY_MOVEMENT_SPEED,
+        )
+
+    def handle_bosses(self, delta_time):
+        for boss in self.boss_list:
+            # Keep boss within world circle
+            self.keep_sprite_within_world(boss)
+
+            distance_to_player = arcade.get_distance_between_sprites(boss, self.player_sprite)
+
+            # Boss always follows the player
+            dx = self.player_sprite.center_x - boss.center_x
+            dy = self.player_sprite.center_y - boss.center_y
+            boss.angle = math.degrees(math.atan2(dy, dx))
+
+            if distance_to_player > BOSS_SHOOT_RANGE:
+                # Move towards player along the flow field
+                change_x, change_y = self.chase_velocity([boss.center_x], [boss.center_y], BOSS_MOVEMENT_SPEED)
+                boss.change_x, boss.change_y = float(change_x[0]), float(change_y[0])
+            else:
+                # Stop movement
+                boss.change_x = 0
+                boss.change_y = 0
+
+                # Shoot at player
+                if boss.shoot_timer <= 0:
+                    if self.is_within_cone(
+                        boss,
+                        self.player_sprite.center_x,
+                        self.player_sprite.center_y,
+                        boss.angle,
+                        BOSS_SHOOT_RANGE,
+                        CONE_ANGLE,
+                    ) and self.has_line_of_sight(boss, self.player_sprite):
+                        self.bullets.spawn(boss.center_x, boss.center_y, boss.angle, 'boss')
+                        boss.shoot_timer = BOSS_SHOOT_DELAY
+
+                        # Reset the time since last fire
+                        boss.time_since_last_fire = 0
+                else:
+                    # Boss cannot fire yet
+                    boss.shoot_timer -= delta_time
+                    # Increment time since last fire
+                    boss.time_since_last_fire += delta_time
+
+    def handle_pickups(self):
+        for kind, amount in self.pickups.collect(self.player_sprite):
+            if kind == 'ammo':
+                self.player_sprite.ammo += amount
+            else:
+                self.player_sprite.health += amount
+                if self.player_sprite.health > PLAYER_HEALTH:
+                    self.player_sprite.health = PLAYER_HEALTH  # Cap at max health
+
+    def has_line_of_sight(self, shooter, target):
+        """
+        Check if there is a clear line of sight between shooter and target, unobstructed by walls.
+        """
+        return self.has_line_of_sight_to_point(
+            shooter.center_x, shooter.center_y, target.center_x, target.center_y
+        )
+
+    def has_line_of_sight_to_point(self, start_x, start_y, end_x, end_y):
+        """
+        Check if there is a clear line of sight to a point (end_x, end_y) from (start_x, start_y).
+        """
+        # Each pair is only tested against the walls once per step
+        return self.line_of_sight.is_clear(start_x, start_y, end_x, end_y)
+
+
+def hunting_bot(world, rng, step=SIMULATION_STEP):
+    """
+    Input policy for unattended runs: aim at the nearest enemy or boss and walk towards it
+    until it is in cone range, wandering in a new random direction every second otherwise.
+    """
+    wander = (0, 0)
+    steps_left = 0
+
+    def next_input():
+        nonlocal wander, steps_left
+        if steps_left <= 0:
+            wander = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+            steps_left = max(round(1 / step), 1)
+        steps_left -= 1
+
+        player = world.player_sprite
+        targets = list(chain(world.enemy_list, world.boss_list))
+        if not targets:
+            return PlayerInput(wander[0], wander[1], player.center_x + 1, player.center_y)
+
+        target = min(targets, key=lambda sprite: math.hypot(
+            sprite.center_x - player.center_x, sprite.center_y - player.center_y
+        ))
+        dx = target.center_x - player.center_x
+        dy = target.center_y - player.center_y
+        if math.hypot(dx, dy) > CONE_LENGTH * 0.8:
+            move_x = (dx > 0) - (dx < 0)
+            move_y = (dy > 0) - (dy < 0)
+        else:
+            move_x, move_y = wander
+        return PlayerInput(move_x, move_y, target.center_x, target.center_y)
+
+    return next_input
+
+
+def run_headless(seconds, seed=0, map_file=DEFAULT_MAP, speed=None, step=SIMULATION_STEP):
+    """
+    Simulate up to `seconds` of game time with the hunting bot in steps of `step` seconds,
+    as fast as possible or at `speed` times real time.
+    Returns a summary of the outcome, the step times and what each pool allocated per wave.
+    """
+    random.seed(seed)
+    world = World()
+    world.setup(map_file)
+    next_input = hunting_bot(world, random.Random(seed), step)
+
+    steps = round(seconds / step)
+    step_times = []
+    start = time.perf_counter()
+    for index in range(steps):
+        step_start = time.perf_counter()
+        world.step(step, next_input())
+        world.drain_events()
+        step_times.append(time.perf_counter() - step_start)
+        world.wave_manager.record_frame(step_times[-1])
+        if world.player_dead:
+            break
+        if speed:
+            # Hold the pace at `speed` times real time
+            delay = start + (index + 1) * step / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    elapsed = time.perf_counter() - start
+
+    simulated = len(step_times) * step
+    step_times.sort()
+    worst_transition = world.wave_manager.worst_transition()
+    return {
+        "simulated_seconds": round(simulated, 2),
+        "wall_seconds": round(elapsed, 2),
+        "realtime_factor": round(simulated / elapsed, 1) if elapsed else math.inf,
+        "steps": len(step_times),
+        "mean_step_ms": round(1000 * sum(step_times) / len(step_times), 3),
+        "p99_step_ms": round(1000 * step_times[int(0.99 * (len(step_times) - 1))], 3),
+        "max_step_ms": round(1000 * step_times[-1], 3),
+        "worst_wave_start_step_ms": round(1000 * worst_transition[1], 3) if worst_transition else None,
+        "worst_wave_start": worst_transition[0] if worst_transition else None,
+        "wave": world.wave_number,
+        "enemies_killed": world.enemies_killed,
+        "bosses_defeated": world.bosses_defeated,
+        "player_health": world.player_sprite.health,
+        "player_dead": world.player_dead,
+        "high_score": world.high_score(),
+        "allocations_per_wave": world.allocation_report.waves,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the game simulation without a window.")
+    parser.add_argument("--seconds", type=float, default=300, help="game time to simulate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--map", default=DEFAULT_MAP)
+    parser.add_argument("--speed", type=float, default=None,
+                        help="times real time to run at (default: as fast as possible)")
+    parser.add_argument("--step", type=float, default=SIMULATION_STEP,
+                        help="seconds of game time per step; bullets are swept, so coarse steps do not tunnel")
+    args = parser.parse_args()
+    print(json.dumps(run_headless(args.seconds, args.seed, args.map, args.speed, args.step), indent=2))